@@ -3,7 +3,15 @@
 from .memory_models import MemoryEntry, MemoryMetadata, MemoryTier, ArchivalTrigger, MemoryHealth
 from .embedding_generator import EmbeddingGenerator, get_embedding_generator
 from .vector_store import VectorStore
-from .archival_pipeline import ArchivalPipeline, ArchivalScheduler, MemoryCompressor, ImportanceScorer
+from .tier1_index import Tier1Index
+from .memory_graph import MemoryGraph
+from .context_manager import ContextManager
+from .snapshot import export_snapshot, import_snapshot, SnapshotReplica
+from .cluster_index import ClusterIndex, MiniBatchKMeans
+from .archival_pipeline import (
+    ArchivalPipeline, ArchivalScheduler, MemoryCompressor, ImportanceScorer, ClusterConsolidator,
+    SchedulerMetrics
+)
 
 __all__ = [
     "MemoryEntry",
@@ -18,4 +26,14 @@ __all__ = [
     "ArchivalScheduler",
     "MemoryCompressor",
     "ImportanceScorer",
+    "Tier1Index",
+    "MemoryGraph",
+    "ContextManager",
+    "export_snapshot",
+    "import_snapshot",
+    "SnapshotReplica",
+    "ClusterIndex",
+    "MiniBatchKMeans",
+    "ClusterConsolidator",
+    "SchedulerMetrics",
 ]
@@ -4,15 +4,23 @@ Manages the transition of memories from Tier 1 (active) to Tier 2 (persistent)
 Includes compression, summarization, and intelligent archival triggers
 """
 
-from typing import List, Optional, Callable
+from typing import List, Any, Optional, Callable, Tuple
 from datetime import datetime
+from collections import Counter, deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 import asyncio
+import time
+import json
+import math
+import numpy as np
 from .memory_models import (
     MemoryEntry, MemoryTier, ArchivalTrigger,
     MemoryHealth
 )
 from .vector_store import VectorStore
 from .embedding_generator import get_embedding_generator
+from .cluster_index import ClusterIndex, MiniBatchKMeans, nearest_centroids
 
 
 class MemoryCompressor:
@@ -88,17 +96,23 @@ class ArchivalPipeline:
         vector_store: VectorStore,
         trigger: Optional[ArchivalTrigger] = None,
         compressor: Optional[MemoryCompressor] = None,
-        importance_scorer: Optional[ImportanceScorer] = None
+        importance_scorer: Optional[ImportanceScorer] = None,
+        scan_batch_size: int = 256
     ):
         self.vector_store = vector_store
         self.trigger = trigger or ArchivalTrigger()
         self.compressor = compressor or MemoryCompressor()
         self.importance_scorer = importance_scorer or ImportanceScorer()
         self.embedding_gen = get_embedding_generator()
-
-    def evaluate_candidates(self, current_token_usage: float) -> List[MemoryEntry]:
-        """Determine which Tier 1 entries should be archived"""
-        tier1_entries = self.vector_store.list_tier_entries(MemoryTier.TIER_1_ACTIVE)
+        self.scan_batch_size = scan_batch_size
+        self.backlog = 0
+        self._pending: deque = deque()  # Tier 1 IDs left to evaluate in this pass
+
+    def evaluate_candidates(self, current_token_usage: float,
+                            entries: Optional[List[MemoryEntry]] = None) -> List[MemoryEntry]:
+        """Determine which Tier 1 entries (default: all of them) should be archived"""
+        tier1_entries = (entries if entries is not None
+                         else self.vector_store.list_tier_entries(MemoryTier.TIER_1_ACTIVE))
         candidates = []
 
         for entry in tier1_entries:
@@ -111,34 +125,77 @@ class ArchivalPipeline:
     def archive_candidates(
         self,
         current_token_usage: float,
-        target_ratio: float = 0.3
+        target_ratio: float = 0.3,
+        max_items: Optional[int] = None,
+        time_budget_seconds: Optional[float] = None
     ) -> List[str]:
         """
         Archive eligible Tier 1 entries
 
+        Tier 1 is scanned from the in-memory index in chunks of
+        scan_batch_size entries, and each chunk's candidates are archived
+        least important first. Scanning counts against the caps as well as
+        archiving: when a cap is hit, the rest of the pass (including any
+        unarchived candidates) is resumed by the next call. The number of
+        entries still to evaluate is kept in `self.backlog`.
+
         Args:
             current_token_usage: Current token usage ratio
             target_ratio: Compression ratio for summaries
+            max_items: Optional cap on entries archived in this call
+            time_budget_seconds: Optional wall-clock cap for this call
 
         Returns:
             List of archived memory IDs
         """
         archived_ids = []
-        candidates = self.evaluate_candidates(current_token_usage)
-
-        for entry in candidates:
-            if not entry.summary and len(entry.content.split()) > 50:
-                entry.summary = self.compressor.compress(entry.content, target_ratio=target_ratio)
+        deadline = (time.monotonic() + time_budget_seconds
+                    if time_budget_seconds is not None else None)
+
+        def out_of_budget(progressed: bool) -> bool:
+            if max_items is not None and len(archived_ids) >= max_items:
+                return True
+            return progressed and deadline is not None and time.monotonic() >= deadline
+
+        index = self.vector_store.tier1_index
+        if not self._pending:
+            self._pending = deque(entry.id for entry in index.entries())
+
+        scanned = False
+        while self._pending and not out_of_budget(scanned):
+            chunk = [self._pending.popleft()
+                     for _ in range(min(self.scan_batch_size, len(self._pending)))]
+            entries = []
+            for memory_id in chunk:
+                cached = index.get(memory_id)
+                if cached is not None:
+                    entries.append(replace(cached, metadata=replace(cached.metadata)))
+
+            candidates = self.evaluate_candidates(current_token_usage, entries)
+            candidates.sort(key=lambda e: e.metadata.importance_score)
+            scanned = True
+
+            for i, entry in enumerate(candidates):
+                if out_of_budget(bool(archived_ids)):
+                    self._pending.extendleft(reversed([e.id for e in candidates[i:]]))
+                    break
+                self._archive_entry(entry, target_ratio)
+                archived_ids.append(entry.id)
+
+        self.backlog = len(self._pending)
+        return archived_ids
 
-            if entry.summary:
-                entry.embedding = self.embedding_gen.generate(entry.summary)
+    def _archive_entry(self, entry: MemoryEntry, target_ratio: float):
+        """Summarize an entry and move it to Tier 2"""
+        if not entry.summary and len(entry.content.split()) > 50:
+            entry.summary = self.compressor.compress(entry.content, target_ratio=target_ratio)
 
-            entry.metadata.tier = MemoryTier.TIER_2_PERSISTENT
-            self.vector_store.add_memory(entry)
-            self.vector_store.delete_memory(entry.id)
-            archived_ids.append(entry.id)
+        if entry.summary:
+            entry.embedding = self.embedding_gen.generate(entry.summary)
 
-        return archived_ids
+        entry.metadata.tier = MemoryTier.TIER_2_PERSISTENT
+        self.vector_store.add_memory(entry)
+        self.vector_store.delete_memory(entry.id, entry.metadata.namespace)
 
     def get_health(self, current_token_usage: float) -> MemoryHealth:
         """Build health metrics for memory tiers"""
@@ -169,29 +226,489 @@ class ArchivalPipeline:
         )
 
 
+@dataclass
+class _ConsolidationJob:
+    """State of an in-progress consolidation of one Tier 2 collection"""
+    collection: Any
+    clusters: ClusterIndex
+    stage: str = "load"
+    offset: int = 0
+    ids: List[str] = field(default_factory=list)
+    topics: List[List[str]] = field(default_factory=list)
+    blocks: List[np.ndarray] = field(default_factory=list)
+    embeddings: Optional[np.ndarray] = None
+    kmeans: Optional[MiniBatchKMeans] = None
+    centroids: Optional[np.ndarray] = None
+    seen: Optional[np.ndarray] = None
+    iterations: int = 0
+    labels: Optional[np.ndarray] = None
+    summaries: List[str] = field(default_factory=list)
+    cluster_topics: List[List[str]] = field(default_factory=list)
+    cluster_ids: List[str] = field(default_factory=list)
+
+
+class ClusterConsolidator:
+    """Periodically cluster Tier 2 embeddings into summarized centroid records
+
+    Every Tier 2 collection (the base one and each namespace shard) has its
+    own cluster index and is consolidated separately. A consolidation is a
+    resumable job that runs through a fixed sequence of stages: load, fit,
+    label, describe, swap, write, sweep and finish. Each call to step()
+    advances it by bounded units of work (a page of entries, a few k-means
+    iterations, one cluster summary) until its time budget runs out, so it
+    can share a scheduler cycle with archival. Searches stay correct
+    throughout: members keep their previous cluster IDs, which remain
+    routable as retired IDs until the sweep relabels them.
+    """
+
+    FIT_ITERATIONS_PER_UNIT = 10
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        compressor: Optional[MemoryCompressor] = None,
+        min_entries: int = 200,
+        batch_size: int = 256,
+        max_iter: int = 100,
+        page_size: int = 1000,
+        summary_members: int = 5,
+        max_unassigned_ratio: float = 0.1,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize consolidator
+
+        Args:
+            vector_store: Store whose Tier 2 collections are clustered
+            compressor: Compressor used to build cluster summaries
+            min_entries: Minimum collection size before clustering is worthwhile
+            batch_size: Mini-batch size for k-means
+            max_iter: Mini-batch iterations per consolidation
+            page_size: Entries read or written per unit of work
+            summary_members: Members closest to each centroid used for its summary
+            max_unassigned_ratio: Share of unclustered entries that forces a rebuild
+            seed: Optional random seed for reproducible clustering
+        """
+        self.vector_store = vector_store
+        self.compressor = compressor or MemoryCompressor()
+        self.min_entries = min_entries
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self.page_size = page_size
+        self.summary_members = summary_members
+        self.max_unassigned_ratio = max_unassigned_ratio
+        self.seed = seed
+        self._job: Optional[_ConsolidationJob] = None
+        self._stages = {
+            "load": self._load_page,
+            "fit": self._fit_iterations,
+            "label": self._label_page,
+            "describe": self._describe_cluster,
+            "swap": self._swap,
+            "write": self._write_page,
+            "sweep": self._sweep_page,
+            "finish": self._finish,
+        }
+
+    @staticmethod
+    def target_clusters(n_entries: int) -> int:
+        """Cluster count for a Tier 2 of the given size (sqrt scaling)"""
+        return max(1, int(math.sqrt(n_entries)))
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether a consolidation has been started and not yet finished"""
+        return self._job is not None
+
+    def should_consolidate(self) -> bool:
+        """Check whether any Tier 2 collection needs a full re-clustering"""
+        return self._next_collection() is not None
+
+    def needs_consolidation(self, collection) -> bool:
+        """
+        Check whether a Tier 2 collection needs a full re-clustering
+
+        Incremental assignment keeps the index usable between runs; a rebuild
+        is only needed once the collection is big enough, too many entries
+        are still unassigned, or growth calls for at least twice as many
+        clusters.
+        """
+        clusters = self.vector_store.cluster_index_for(collection)
+        total = collection.count()
+        if total < self.min_entries:
+            return False
+        if not clusters.is_trained:
+            return True
+
+        unassigned = len(collection.get(
+            where={ClusterIndex.CLUSTER_KEY: ClusterIndex.UNASSIGNED}, include=[]
+        )["ids"])
+        if unassigned > self.max_unassigned_ratio * total:
+            return True
+        return self.target_clusters(total) >= 2 * len(clusters.cluster_ids)
+
+    def _next_collection(self):
+        """First Tier 2 collection that needs consolidating, if any"""
+        for collection in self.vector_store.get_shards(MemoryTier.TIER_2_PERSISTENT):
+            if self.needs_consolidation(collection):
+                return collection
+        return None
+
+    def consolidate(self, collection=None) -> int:
+        """
+        Re-cluster Tier 2 and rewrite centroid records and member assignments
+
+        Runs whole jobs at once: the rest of any job already in progress,
+        then one for the given collection (default: every Tier 2 collection).
+
+        Returns:
+            Number of clusters written
+        """
+        written = self.step() if self._job is not None else 0
+        targets = ([collection] if collection is not None
+                   else self.vector_store.get_shards(MemoryTier.TIER_2_PERSISTENT))
+        for target in targets:
+            self._job = self._new_job(target)
+            written += self.step()
+        return written
+
+    def _new_job(self, collection) -> _ConsolidationJob:
+        return _ConsolidationJob(
+            collection=collection,
+            clusters=self.vector_store.cluster_index_for(collection)
+        )
+
+    def step(self, time_budget_seconds: Optional[float] = None) -> Optional[int]:
+        """
+        Advance the consolidation job, starting one if none is in progress
+
+        A new job picks the first Tier 2 collection that needs consolidating.
+        At least one unit of work is done per call, so the job always makes
+        progress even with a zero budget.
+
+        Args:
+            time_budget_seconds: Wall-clock cap for this call (None: run to completion)
+
+        Returns:
+            Number of clusters written once the job finishes (0 if there was
+            nothing to consolidate), None while it is still in progress
+        """
+        if self._job is None:
+            collection = self._next_collection()
+            if collection is None:
+                return 0
+            self._job = self._new_job(collection)
+        job = self._job
+        deadline = (time.monotonic() + time_budget_seconds
+                    if time_budget_seconds is not None else None)
+
+        while True:
+            result = self._stages[job.stage](job)
+            if job.stage == "done":
+                self._job = None
+                return result
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def _load_page(self, job: _ConsolidationJob) -> int:
+        """Read one page of Tier 2 embeddings and topics"""
+        page = job.collection.get(
+            limit=self.page_size,
+            offset=job.offset,
+            include=["embeddings", "metadatas"]
+        )
+        if page.get("ids"):
+            job.ids.extend(page["ids"])
+            job.topics.extend(json.loads(m.get("topics", "[]")) for m in page["metadatas"])
+            job.blocks.append(np.asarray(page["embeddings"], dtype=np.float32))
+            job.offset += len(page["ids"])
+            return 0
+
+        if len(job.ids) < self.min_entries:
+            job.stage = "done"
+            return 0
+
+        job.embeddings = np.vstack(job.blocks)
+        job.blocks = []
+        job.kmeans = MiniBatchKMeans(
+            n_clusters=self.target_clusters(len(job.ids)),
+            batch_size=self.batch_size,
+            max_iter=self.max_iter,
+            seed=self.seed
+        )
+        job.centroids = job.kmeans.init_centroids(
+            job.embeddings, job.clusters.centroids
+        )
+        job.seen = np.zeros(job.centroids.shape[0], dtype=np.float64)
+        job.stage = "fit"
+        return 0
+
+    def _fit_iterations(self, job: _ConsolidationJob) -> int:
+        """Run a few mini-batch k-means iterations"""
+        n_iter = min(self.FIT_ITERATIONS_PER_UNIT, self.max_iter - job.iterations)
+        job.kmeans.partial_fit(job.embeddings, job.centroids, job.seen, n_iter)
+        job.iterations += n_iter
+        if job.iterations >= self.max_iter:
+            job.labels = np.empty(len(job.ids), dtype=np.int64)
+            job.offset = 0
+            job.stage = "label"
+        return 0
+
+    def _label_page(self, job: _ConsolidationJob) -> int:
+        """Label one page of entries with their nearest centroid"""
+        page = slice(job.offset, job.offset + self.page_size)
+        job.labels[page] = nearest_centroids(job.embeddings[page], job.centroids)
+        job.offset += self.page_size
+        if job.offset < len(job.ids):
+            return 0
+
+        # Drop clusters that ended up empty and compact the labels
+        counts = np.bincount(job.labels, minlength=job.centroids.shape[0])
+        keep = np.flatnonzero(counts)
+        remap = np.full(job.centroids.shape[0], -1, dtype=np.int64)
+        remap[keep] = np.arange(len(keep))
+        job.centroids, job.labels = job.centroids[keep], remap[job.labels]
+        job.stage = "describe"
+        return 0
+
+    def _describe_cluster(self, job: _ConsolidationJob) -> int:
+        """Build the summary and top topics of the next cluster from its members"""
+        c = len(job.summaries)
+        members = np.flatnonzero(job.labels == c)
+        distances = np.sum((job.embeddings[members] - job.centroids[c]) ** 2, axis=1)
+        closest = members[np.argsort(distances)[:self.summary_members]]
+
+        result = job.collection.get(
+            ids=[job.ids[i] for i in closest],
+            include=["documents", "metadatas"]
+        )
+        texts = [
+            (metadata.get("summary") or document).strip().rstrip(".")
+            for document, metadata in zip(result["documents"], result["metadatas"])
+        ]
+        job.summaries.append(self.compressor.compress(". ".join(texts) + ".") if texts else "")
+
+        topic_counts = Counter()
+        for i in members:
+            topic_counts.update(job.topics[i])
+        job.cluster_topics.append([topic for topic, _ in topic_counts.most_common(5)])
+
+        if len(job.summaries) == job.centroids.shape[0]:
+            job.stage = "swap"
+        return 0
+
+    def _swap(self, job: _ConsolidationJob) -> int:
+        """Install the new centroids, retiring the previous generation"""
+        counts = np.bincount(job.labels, minlength=job.centroids.shape[0])
+        job.cluster_ids = job.clusters.replace(
+            job.centroids, counts, job.summaries, job.cluster_topics
+        )
+        job.offset = 0
+        job.stage = "write"
+        return 0
+
+    def _write_page(self, job: _ConsolidationJob) -> int:
+        """Write new cluster IDs to one page of members"""
+        page = slice(job.offset, job.offset + self.page_size)
+        ids = job.ids[page]
+        if ids:
+            job.collection.update(
+                ids=ids,
+                metadatas=[
+                    {ClusterIndex.CLUSTER_KEY: job.cluster_ids[label]} for label in job.labels[page]
+                ]
+            )
+        job.offset += self.page_size
+        if job.offset >= len(job.ids):
+            job.stage = "sweep"
+        return 0
+
+    def _sweep_page(self, job: _ConsolidationJob) -> int:
+        """
+        Assign one page of entries still unassigned or on a retired cluster
+
+        Picks up entries archived while the job was running, which were
+        labelled by the previous generation or not labelled at all.
+        """
+        clusters, collection = job.clusters, job.collection
+        page = collection.get(
+            where={ClusterIndex.CLUSTER_KEY: {"$in": clusters.retired + [ClusterIndex.UNASSIGNED]}},
+            limit=self.page_size,
+            include=["embeddings"]
+        )
+        if not page.get("ids"):
+            job.stage = "finish"
+            return 0
+
+        cluster_ids = clusters.assign_many(page["embeddings"])
+        collection.update(
+            ids=page["ids"],
+            metadatas=[{ClusterIndex.CLUSTER_KEY: cluster_id} for cluster_id in cluster_ids]
+        )
+        return 0
+
+    def _finish(self, job: _ConsolidationJob) -> int:
+        """Delete the retired centroid records"""
+        job.clusters.drop_retired()
+        job.stage = "done"
+        return len(job.cluster_ids)
+
+
+@dataclass
+class SchedulerMetrics:
+    """Runtime metrics for the archival scheduler"""
+    cycles_run: int = 0
+    last_cycle_duration: float = 0.0  # seconds
+    avg_cycle_duration: float = 0.0  # seconds
+    last_archived: int = 0
+    total_archived: int = 0
+    backlog: int = 0  # Tier 1 entries not yet evaluated in the current pass
+    skipped_ticks: int = 0  # scheduled ticks that passed while a cycle overran
+    current_interval: float = 0.0  # seconds
+    last_token_usage: float = 0.0
+    consolidations_run: int = 0
+
+
 class ArchivalScheduler:
-    """Background scheduler for periodic archival"""
+    """Background scheduler for periodic archival
+
+    Cycles run on a worker thread so the synchronous pipeline never blocks
+    the event loop. Each cycle, including Tier 1 evaluation and Tier 2
+    consolidation, is capped by time and item count; leftover work is
+    resumed on the next cycle. The interval shrinks under
+    token pressure or while a backlog remains, and backs off when idle.
+    """
 
-    def __init__(self, pipeline: ArchivalPipeline, interval_seconds: int = 300):
+    def __init__(
+        self,
+        pipeline: ArchivalPipeline,
+        interval_seconds: int = 300,
+        consolidator: Optional[ClusterConsolidator] = None,
+        min_interval_seconds: Optional[float] = None,
+        max_interval_seconds: Optional[float] = None,
+        time_budget_seconds: Optional[float] = 5.0,
+        max_items_per_cycle: Optional[int] = None,
+        high_pressure_threshold: Optional[float] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            pipeline: Archival pipeline to run
+            interval_seconds: Base interval between cycles
+            consolidator: Optional Tier 2 consolidator run when idle
+            min_interval_seconds: Shortest interval under pressure (default base / 8)
+            max_interval_seconds: Longest interval when idle (default base * 4)
+            time_budget_seconds: Wall-clock cap per cycle
+            max_items_per_cycle: Cap on entries archived per cycle
+            high_pressure_threshold: Token usage that counts as high pressure
+                (default: the pipeline trigger's token_pressure_threshold)
+            executor: Executor for cycles (default: a private single worker thread)
+        """
         self.pipeline = pipeline
         self.interval_seconds = interval_seconds
+        self.consolidator = consolidator
+        self.min_interval_seconds = (min_interval_seconds if min_interval_seconds is not None
+                                     else interval_seconds / 8)
+        self.max_interval_seconds = (max_interval_seconds if max_interval_seconds is not None
+                                     else interval_seconds * 4)
+        self.time_budget_seconds = time_budget_seconds
+        self.max_items_per_cycle = max_items_per_cycle
+        self.high_pressure_threshold = (high_pressure_threshold if high_pressure_threshold is not None
+                                        else pipeline.trigger.token_pressure_threshold)
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._metrics = SchedulerMetrics(current_interval=float(interval_seconds))
         self._task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
 
+    def _run_cycle(self, token_usage: float) -> Tuple[int, bool]:
+        """
+        Run one bounded archival cycle (called on the worker thread)
+
+        Consolidation only runs once no archival work is pending, and gets
+        whatever is left of the cycle's time budget.
+        """
+        started = time.monotonic()
+        archived = self.pipeline.archive_candidates(
+            token_usage,
+            max_items=self.max_items_per_cycle,
+            time_budget_seconds=self.time_budget_seconds
+        )
+
+        consolidated = False
+        if self.consolidator and self.pipeline.backlog == 0 and (
+                self.consolidator.in_progress or self.consolidator.should_consolidate()):
+            remaining = (None if self.time_budget_seconds is None
+                         else max(0.0, self.time_budget_seconds - (time.monotonic() - started)))
+            consolidated = self.consolidator.step(remaining) is not None
+
+        return len(archived), consolidated
+
+    def _next_interval(self, token_usage: float, archived: int) -> float:
+        """Adapt the interval to token pressure and remaining work"""
+        current = self._metrics.current_interval
+        if token_usage >= self.high_pressure_threshold:
+            return max(self.min_interval_seconds, current / 2)
+        if self.pipeline.backlog > 0:
+            return max(self.min_interval_seconds, min(current, self.interval_seconds) / 2)
+        if archived == 0:
+            return min(self.max_interval_seconds, max(current, self.interval_seconds) * 2)
+        return float(self.interval_seconds)
+
     async def _run_loop(self, token_usage_provider: Callable[[], float]):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+
         while not self._stop_event.is_set():
-            token_usage = token_usage_provider()
-            self.pipeline.archive_candidates(token_usage)
+            # The provider may hit storage (e.g. loading the token ledger)
+            token_usage = await loop.run_in_executor(self._executor, token_usage_provider)
+
+            started = time.monotonic()
+            archived, consolidated = await loop.run_in_executor(
+                self._executor, self._run_cycle, token_usage
+            )
+            duration = time.monotonic() - started
+
+            metrics = self._metrics
+            metrics.cycles_run += 1
+            metrics.last_cycle_duration = duration
+            metrics.avg_cycle_duration += (duration - metrics.avg_cycle_duration) / metrics.cycles_run
+            metrics.last_archived = archived
+            metrics.total_archived += archived
+            metrics.backlog = self.pipeline.backlog
+            metrics.last_token_usage = token_usage
+            metrics.consolidations_run += int(consolidated)
+            metrics.current_interval = self._next_interval(token_usage, archived)
+
+            # Cycles start on a fixed grid of deadlines; ticks that passed
+            # while a cycle overran are skipped and counted
+            deadline += metrics.current_interval
+            now = loop.time()
+            if now > deadline:
+                if metrics.current_interval > 0:
+                    missed = math.floor((now - deadline) / metrics.current_interval) + 1
+                    metrics.skipped_ticks += missed
+                    deadline += missed * metrics.current_interval
+                else:
+                    deadline = now
 
             try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=self.interval_seconds)
+                await asyncio.wait_for(self._stop_event.wait(), timeout=deadline - now)
             except asyncio.TimeoutError:
                 continue
 
+    def get_metrics(self) -> SchedulerMetrics:
+        """Snapshot of scheduler metrics"""
+        return replace(self._metrics)
+
     def start(self, token_usage_provider: Callable[[], float]) -> None:
         """Start background archival loop"""
         if self._task and not self._task.done():
             return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archival")
         self._stop_event.clear()
         self._task = asyncio.create_task(self._run_loop(token_usage_provider))
 
@@ -200,3 +717,6 @@ class ArchivalScheduler:
         self._stop_event.set()
         if self._task:
             await self._task
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
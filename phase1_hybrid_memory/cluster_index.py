@@ -0,0 +1,344 @@
+"""
+Hierarchical Cluster Index for Tier 2
+Mini-batch k-means clustering of persistent memory embeddings, used to route
+semantic searches to the nearest clusters instead of the whole collection
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+import json
+import threading
+import numpy as np
+
+
+class MiniBatchKMeans:
+    """Mini-batch k-means over a float32 embedding matrix"""
+
+    def __init__(self, n_clusters: int, batch_size: int = 256,
+                 max_iter: int = 100, seed: Optional[int] = None):
+        """
+        Initialize the clusterer
+
+        Args:
+            n_clusters: Number of clusters to fit
+            batch_size: Number of samples drawn per iteration
+            max_iter: Number of mini-batch iterations
+            seed: Optional random seed for reproducible fits
+        """
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.max_iter = max_iter
+        self._rng = np.random.default_rng(seed)
+
+    def fit(self, embeddings: np.ndarray,
+            centroids: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fit centroids to the given embeddings
+
+        Args:
+            embeddings: (n, dim) float32 matrix
+            centroids: Optional initial centroids to refine (warm start)
+
+        Returns:
+            Tuple of (centroids, labels) where labels assigns every row
+        """
+        centroids = self.init_centroids(embeddings, centroids)
+        seen = np.zeros(centroids.shape[0], dtype=np.float64)
+        self.partial_fit(embeddings, centroids, seen, self.max_iter)
+        return centroids, self.predict(embeddings, centroids)
+
+    def init_centroids(self, embeddings: np.ndarray,
+                       centroids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Starting centroids: a copy of the warm start, or random rows"""
+        n = embeddings.shape[0]
+        k = min(self.n_clusters, n)
+        if centroids is None or centroids.shape[0] != k:
+            init_idx = self._rng.choice(n, size=k, replace=False)
+            return embeddings[init_idx].copy()
+        return centroids.astype(np.float32, copy=True)
+
+    def partial_fit(self, embeddings: np.ndarray, centroids: np.ndarray,
+                    seen: np.ndarray, n_iter: int):
+        """
+        Run mini-batch iterations, updating centroids in place
+
+        Args:
+            embeddings: (n, dim) float32 matrix
+            centroids: (k, dim) centroids to refine
+            seen: Per-centre sample counts, carried between calls so each
+                centre keeps its own decaying learning rate
+            n_iter: Number of iterations to run
+        """
+        n = embeddings.shape[0]
+        batch_size = min(self.batch_size, n)
+
+        for _ in range(n_iter):
+            batch = embeddings[self._rng.choice(n, size=batch_size, replace=False)]
+            labels = nearest_centroids(batch, centroids)
+            for c in np.unique(labels):
+                members = batch[labels == c]
+                seen[c] += len(members)
+                rate = len(members) / seen[c]
+                centroids[c] += rate * (members.mean(axis=0) - centroids[c])
+
+    def predict(self, embeddings: np.ndarray, centroids: np.ndarray,
+                block_size: int = 4096) -> np.ndarray:
+        """Assign each embedding to its nearest centroid"""
+        labels = np.empty(embeddings.shape[0], dtype=np.int64)
+        for start in range(0, embeddings.shape[0], block_size):
+            block = embeddings[start:start + block_size]
+            labels[start:start + block_size] = nearest_centroids(block, centroids)
+        return labels
+
+
+def nearest_centroids(embeddings: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest centroid (squared L2) for each row"""
+    distances = (
+        np.einsum("ij,ij->i", embeddings, embeddings)[:, None]
+        - 2.0 * embeddings @ centroids.T
+        + np.einsum("ij,ij->i", centroids, centroids)[None, :]
+    )
+    return np.argmin(distances, axis=1)
+
+
+class ClusterIndex:
+    """Centroid records for Tier 2, kept in memory and persisted to ChromaDB
+
+    Each consolidation writes a new generation of cluster IDs. The previous
+    generation is kept as retired records until every member has been
+    relabelled, so searches can still reach members that carry an old ID.
+    """
+
+    CLUSTER_KEY = "cluster_id"
+    UNASSIGNED = ""  # cluster_id of entries written before the index was built
+
+    def __init__(self, collection):
+        """
+        Initialize cluster index
+
+        Args:
+            collection: ChromaDB collection holding one record per centroid
+        """
+        self.collection = collection
+        self.cluster_ids: List[str] = []
+        self.retired: List[str] = []
+        self.generation = 0
+        self.centroids: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self):
+        """Load centroid records from the collection"""
+        results = self.collection.get(include=["embeddings", "metadatas"])
+        ids = results.get("ids") or []
+        metadatas = results.get("metadatas") or []
+
+        active = [i for i, m in enumerate(metadatas) if not m.get("retired")]
+        self.retired = [ids[i] for i, m in enumerate(metadatas) if m.get("retired")]
+        self.generation = max((m.get("generation", 0) for m in metadatas), default=0)
+        if not active:
+            self.cluster_ids = []
+            self.centroids = None
+            self.counts = None
+            return
+
+        self.cluster_ids = [ids[i] for i in active]
+        self.centroids = np.asarray(results["embeddings"], dtype=np.float32)[active]
+        self.counts = np.array(
+            [metadatas[i].get("member_count", 0) for i in active], dtype=np.int64
+        )
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether centroids are available for routing"""
+        return self.centroids is not None and len(self.cluster_ids) > 0
+
+    def route(self, embedding: List[float], n_probe: int) -> List[str]:
+        """
+        Find the clusters nearest to a query embedding
+
+        Args:
+            embedding: Query embedding
+            n_probe: Number of clusters to return
+
+        Returns:
+            Cluster IDs ordered from nearest to farthest
+        """
+        if not self.is_trained:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        distances = np.sum((self.centroids - query) ** 2, axis=1)
+        n_probe = min(n_probe, len(self.cluster_ids))
+        nearest = np.argpartition(distances, n_probe - 1)[:n_probe]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [self.cluster_ids[i] for i in nearest]
+
+    def member_count(self, cluster_ids: List[str]) -> int:
+        """Total number of members across the given clusters"""
+        if not self.is_trained:
+            return 0
+        positions = {cid: i for i, cid in enumerate(self.cluster_ids)}
+        return int(sum(self.counts[positions[cid]] for cid in cluster_ids if cid in positions))
+
+    def assign(self, embedding: List[float]) -> Optional[str]:
+        """
+        Assign a new Tier 2 embedding to its nearest cluster
+
+        The centroid is moved towards the new member with a 1/count learning
+        rate, the same online update used by mini-batch k-means, so clusters
+        track incoming archives without a full rebuild.
+
+        Args:
+            embedding: Embedding of the archived memory
+
+        Returns:
+            Cluster ID, or None if the index has not been built yet
+        """
+        if not self.is_trained:
+            return None
+        return self.assign_many([embedding])[0]
+
+    def assign_many(self, embeddings: List[List[float]]) -> List[str]:
+        """
+        Assign a batch of Tier 2 embeddings (see assign)
+
+        Applying the online update per cluster over the whole batch gives the
+        same centroids as assigning one at a time, with a single write for
+        the touched centroid records.
+
+        Returns:
+            Cluster ID per embedding (UNASSIGNED if the index has not been built)
+        """
+        if len(embeddings) == 0:
+            return []
+
+        with self._lock:
+            if not self.is_trained:
+                return [self.UNASSIGNED] * len(embeddings)
+
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            labels = nearest_centroids(vectors, self.centroids)
+            touched = np.unique(labels)
+            for idx in touched:
+                members = vectors[labels == idx]
+                self.counts[idx] += len(members)
+                self.centroids[idx] += (
+                    members.sum(axis=0) - len(members) * self.centroids[idx]
+                ) / self.counts[idx]
+
+            now = datetime.now().isoformat()
+            self.collection.update(
+                ids=[self.cluster_ids[i] for i in touched],
+                embeddings=self.centroids[touched].tolist(),
+                metadatas=[
+                    {"member_count": int(self.counts[i]), "updated_at": now} for i in touched
+                ]
+            )
+            return [self.cluster_ids[i] for i in labels]
+
+    def release(self, cluster_id: Optional[str]) -> bool:
+        """
+        Record that a member of a cluster was deleted
+
+        Only the member count is decremented; the centroid is left where it
+        is until the next consolidation refits it.
+
+        Args:
+            cluster_id: Cluster the deleted entry belonged to
+
+        Returns:
+            Whether the cluster was found
+        """
+        with self._lock:
+            if not self.is_trained or cluster_id not in self.cluster_ids:
+                return False
+
+            idx = self.cluster_ids.index(cluster_id)
+            self.counts[idx] = max(0, self.counts[idx] - 1)
+            self.collection.update(
+                ids=[cluster_id],
+                metadatas=[{
+                    "member_count": int(self.counts[idx]),
+                    "updated_at": datetime.now().isoformat(),
+                }]
+            )
+            return True
+
+    def replace(self, centroids: np.ndarray, counts: np.ndarray,
+                summaries: List[str], topics: List[List[str]]) -> List[str]:
+        """
+        Install a freshly fitted generation of centroid records
+
+        The current records are marked retired rather than deleted; call
+        drop_retired once no member carries their IDs any more.
+
+        Args:
+            centroids: (k, dim) centroid matrix
+            counts: Member count per centroid
+            summaries: Summary text per centroid
+            topics: Most common member topics per centroid
+
+        Returns:
+            New cluster IDs, in centroid order
+        """
+        with self._lock:
+            if self.cluster_ids:
+                self.collection.update(
+                    ids=self.cluster_ids,
+                    metadatas=[{"retired": True}] * len(self.cluster_ids)
+                )
+                self.retired.extend(self.cluster_ids)
+
+            self.generation += 1
+            cluster_ids = [
+                f"cluster_{self.generation}_{i:05d}" for i in range(centroids.shape[0])
+            ]
+            now = datetime.now().isoformat()
+            metadatas: List[Dict[str, Any]] = [
+                {
+                    "member_count": int(counts[i]),
+                    "topics": json.dumps(topics[i]),
+                    "generation": self.generation,
+                    "updated_at": now,
+                }
+                for i in range(centroids.shape[0])
+            ]
+
+            if cluster_ids:
+                self.collection.add(
+                    ids=cluster_ids,
+                    embeddings=centroids.tolist(),
+                    documents=summaries,
+                    metadatas=metadatas
+                )
+
+            self.cluster_ids = cluster_ids
+            self.centroids = centroids.astype(np.float32, copy=True)
+            self.counts = counts.astype(np.int64, copy=True)
+            return cluster_ids
+
+    def drop_retired(self):
+        """Delete the records of previous generations"""
+        with self._lock:
+            if self.retired:
+                self.collection.delete(ids=self.retired)
+                self.retired = []
+
+    def get_clusters(self) -> List[Dict[str, Any]]:
+        """List centroid records with their summaries"""
+        results = self.collection.get(include=["documents", "metadatas"])
+        clusters = []
+        for i, cluster_id in enumerate(results.get("ids") or []):
+            metadata = results["metadatas"][i]
+            if metadata.get("retired"):
+                continue
+            clusters.append({
+                "id": cluster_id,
+                "summary": results["documents"][i],
+                "member_count": metadata.get("member_count", 0),
+                "topics": json.loads(metadata.get("topics", "[]")),
+                "updated_at": metadata.get("updated_at"),
+            })
+        return clusters
@@ -0,0 +1,166 @@
+"""
+Tier 1 Context Manager
+Token accounting and budgeted context packing for active memory
+"""
+
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from .memory_models import MemoryEntry
+from .vector_store import VectorStore
+
+
+def solve_greedy(values: Sequence[float], weights: Sequence[int], budget: int) -> List[int]:
+    """
+    Greedy knapsack by value density
+
+    Items are taken in order of value per token; the result is compared with
+    the single most valuable item that fits, which bounds the greedy answer
+    at half the optimum.
+
+    Returns:
+        Indices of selected items
+    """
+    order = sorted(
+        range(len(values)),
+        key=lambda i: values[i] / max(weights[i], 1),
+        reverse=True
+    )
+
+    selected = []
+    used = 0
+    for i in order:
+        if values[i] <= 0:
+            break
+        if used + weights[i] <= budget:
+            selected.append(i)
+            used += weights[i]
+
+    fitting = [i for i in range(len(values)) if weights[i] <= budget]
+    if fitting:
+        best_single = max(fitting, key=lambda i: values[i])
+        if values[best_single] > sum(values[i] for i in selected):
+            return [best_single]
+
+    return selected
+
+
+def solve_knapsack(values: Sequence[float], weights: Sequence[int], budget: int,
+                   max_cells: int = 2_000_000) -> List[int]:
+    """
+    0/1 knapsack by dynamic programming over token capacity
+
+    When items x capacity exceeds max_cells the weights are scaled down
+    (rounded up, so the selection never exceeds the real budget), trading
+    exactness for bounded work.
+
+    Returns:
+        Indices of selected items
+    """
+    n = len(values)
+    if n == 0 or budget <= 0:
+        return []
+
+    scale = max(1, -(-(n * budget) // max_cells))
+    capacity = budget // scale
+    scaled = [-(-w // scale) for w in weights]
+
+    best = np.zeros(capacity + 1, dtype=np.float64)
+    keep = np.zeros((n, capacity + 1), dtype=bool)
+    for i in range(n):
+        w = scaled[i]
+        if values[i] <= 0 or w > capacity:
+            continue
+        candidate = best[:capacity + 1 - w] + values[i]
+        improved = candidate > best[w:]
+        keep[i, w:] = improved
+        best[w:] = np.where(improved, candidate, best[w:])
+
+    selected = []
+    c = capacity
+    for i in range(n - 1, -1, -1):
+        if keep[i, c]:
+            selected.append(i)
+            c -= scaled[i]
+
+    selected.reverse()
+    return selected
+
+
+class ContextManager:
+    """Track Tier 1 token usage and pack the most valuable memories into a budget"""
+
+    SOLVERS = {"greedy": solve_greedy, "knapsack": solve_knapsack}
+
+    def __init__(self, vector_store: VectorStore, token_limit: int = 190000):
+        """
+        Initialize context manager
+
+        Args:
+            vector_store: Store holding Tier 1 entries and their token counts
+            token_limit: Context window size in tokens
+        """
+        self.vector_store = vector_store
+        self.token_limit = token_limit
+
+    def total_tokens(self) -> int:
+        """Total tokens held in Tier 1"""
+        return self.vector_store.get_tier1_token_total()
+
+    def token_usage(self) -> float:
+        """
+        Tier 1 token usage as a fraction of the context window
+
+        Suitable as the token_usage_provider for ArchivalScheduler.
+        """
+        if self.token_limit <= 0:
+            return 0.0
+        return self.total_tokens() / self.token_limit
+
+    def pack(self, query: Optional[str] = None, token_budget: Optional[int] = None,
+             solver: str = "greedy", namespace: Optional[str] = None) -> List[Tuple[MemoryEntry, float]]:
+        """
+        Select the Tier 1 memories worth the most within a token budget
+
+        Each entry is valued at relevance x importance, where relevance is the
+        cosine similarity to the query (1.0 for every entry without a query).
+
+        Args:
+            query: Optional text the context should be relevant to
+            token_budget: Token budget (default: the full token limit)
+            solver: "greedy" (fast, density order) or "knapsack" (DP, exact
+                up to weight scaling)
+            namespace: Only consider this namespace's memories
+
+        Returns:
+            List of (MemoryEntry, value) tuples, most valuable first
+        """
+        if solver not in self.SOLVERS:
+            raise ValueError(f"Unknown solver: {solver}")
+
+        budget = self.token_limit if token_budget is None else token_budget
+        if budget <= 0:
+            return []
+
+        index = self.vector_store.tier1_index
+        if query is None:
+            entries = index.entries(namespace)
+            relevance = np.ones(len(entries), dtype=np.float32)
+        else:
+            query_embedding = self.vector_store.embedding_gen.generate(query)
+            entries, relevance = index.cosine(query_embedding, namespace)
+            relevance = np.clip(relevance, 0.0, None)
+        if not entries:
+            return []
+
+        token_counts = self.vector_store.get_tier1_token_counts()
+        weights = [
+            token_counts.get(e.id, e.metadata.token_count or 0) for e in entries
+        ]
+        values = [
+            float(r) * e.metadata.importance_score for r, e in zip(relevance, entries)
+        ]
+
+        selected = self.SOLVERS[solver](values, weights, budget)
+        packed = [(entries[i], values[i]) for i in selected]
+        packed.sort(key=lambda x: x[1], reverse=True)
+        return packed
@@ -4,7 +4,7 @@ Handles text-to-vector conversion for semantic search
 """
 
 from sentence_transformers import SentenceTransformer
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Tuple
 import numpy as np
 from functools import lru_cache
 import hashlib
@@ -117,6 +117,33 @@ class EmbeddingGenerator:
         
         return all_embeddings
     
+    def count_tokens(self, text: Union[str, List[str]]) -> Union[int, List[int]]:
+        """
+        Count tokens using the model's local tokenizer
+        
+        Args:
+            text: Single string or list of strings
+            
+        Returns:
+            Token count(s), excluding special tokens
+        """
+        self._ensure_loaded()
+        
+        is_single = isinstance(text, str)
+        texts = [text] if is_single else text
+        if not texts:
+            return []
+        
+        encoded = self.model.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_attention_mask=False,
+            return_token_type_ids=False
+        )
+        counts = [len(ids) for ids in encoded["input_ids"]]
+        
+        return counts[0] if is_single else counts
+    
     def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
         """
         Calculate cosine similarity between two embeddings
@@ -128,8 +155,8 @@ class EmbeddingGenerator:
         Returns:
             Similarity score (0 to 1)
         """
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        vec1 = np.asarray(embedding1, dtype=np.float32)
+        vec2 = np.asarray(embedding2, dtype=np.float32)
         
         dot_product = np.dot(vec1, vec2)
         norm1 = np.linalg.norm(vec1)
@@ -140,6 +167,86 @@ class EmbeddingGenerator:
         
         return float(dot_product / (norm1 * norm2))
     
+    @staticmethod
+    def _normalize_rows(embeddings) -> np.ndarray:
+        """Float32 copy of embeddings with unit-length rows (zero rows kept)"""
+        matrix = np.array(embeddings, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+    
+    def batch_similarity(self, query: List[float], embeddings) -> np.ndarray:
+        """
+        Cosine similarity of one query against many embeddings
+        
+        Args:
+            query: Query embedding
+            embeddings: (n, dim) matrix or list of embeddings
+            
+        Returns:
+            (n,) float32 array of similarities
+        """
+        matrix = self._normalize_rows(embeddings)
+        return matrix @ self._normalize_rows(query)[0]
+    
+    def top_k(self, query: List[float], embeddings, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indices and similarities of the k embeddings most similar to a query
+        
+        Args:
+            query: Query embedding
+            embeddings: (n, dim) matrix or list of embeddings
+            k: Number of results
+            
+        Returns:
+            Tuple of (indices, similarities), most similar first
+        """
+        scores = self.batch_similarity(query, embeddings)
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return top, scores[top]
+    
+    def knn(self, embeddings, k: int, block_size: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All-pairs k nearest neighbours by cosine similarity, excluding self
+        
+        The similarity matrix is computed one row block at a time, so memory
+        stays at block_size x n instead of n x n.
+        
+        Args:
+            embeddings: (n, dim) matrix or list of embeddings
+            k: Neighbours per row
+            block_size: Rows scored per block
+            
+        Returns:
+            Tuple of (indices, similarities), each (n, min(k, n - 1)), most
+            similar first
+        """
+        matrix = self._normalize_rows(embeddings)
+        n = matrix.shape[0]
+        k = min(k, n - 1)
+        if k <= 0:
+            return np.empty((n, 0), dtype=np.int64), np.empty((n, 0), dtype=np.float32)
+        
+        indices = np.empty((n, k), dtype=np.int64)
+        similarities = np.empty((n, k), dtype=np.float32)
+        for start in range(0, n, block_size):
+            stop = min(start + block_size, n)
+            scores = matrix[start:stop] @ matrix.T
+            scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            indices[start:stop] = np.take_along_axis(top, order, axis=1)
+            similarities[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+        
+        return indices, similarities
+    
     def clear_cache(self):
         """Clear embedding cache"""
         self._embedding_cache.clear()
@@ -0,0 +1,140 @@
+"""
+Related-Memory Graph
+Incrementally maintained k-nearest-neighbour graph over stored memories
+"""
+
+from typing import List, Dict, Optional, Set, Tuple, Iterable
+import threading
+
+
+class MemoryGraph:
+    """k-NN adjacency lists with reverse edges for O(degree) deletes
+
+    Each node keeps at most k outgoing edges, sorted by similarity. Inserting
+    a node sets its own edges from the candidates it is given and offers
+    itself to each of those neighbours, which keep it only if it beats their
+    weakest edge. Every mutating call returns the set of nodes whose edge
+    lists changed, so the caller can persist just those. Each node also
+    records the collection it is stored in, so those writes go straight to
+    the right place. All methods are thread-safe.
+    """
+
+    def __init__(self, k: int = 8):
+        """
+        Initialize graph
+
+        Args:
+            k: Maximum neighbours kept per memory
+        """
+        self.k = k
+        self._edges: Dict[str, List[Tuple[str, float]]] = {}
+        self._incoming: Dict[str, Set[str]] = {}
+        self._locations: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._edges
+
+    def neighbors(self, memory_id: str) -> List[str]:
+        """Neighbour IDs, most similar first"""
+        with self._lock:
+            return [nid for nid, _ in self._edges.get(memory_id, [])]
+
+    def edges(self, memory_id: str) -> List[Tuple[str, float]]:
+        """(neighbour ID, similarity) pairs, most similar first"""
+        with self._lock:
+            return list(self._edges.get(memory_id, []))
+
+    def location(self, memory_id: str) -> Optional[str]:
+        """Name of the collection holding a node, if known"""
+        return self._locations.get(memory_id)
+
+    def set_location(self, memory_id: str, location: str):
+        """Record the collection holding a node"""
+        with self._lock:
+            self._locations[memory_id] = location
+
+    def set_edges(self, memory_id: str, neighbors: Iterable[Tuple[str, float]],
+                  location: Optional[str] = None):
+        """Replace a node's outgoing edges"""
+        with self._lock:
+            for nid, _ in self._edges.get(memory_id, []):
+                self._incoming.get(nid, set()).discard(memory_id)
+
+            edges = sorted(
+                ((nid, float(score)) for nid, score in neighbors if nid != memory_id),
+                key=lambda x: x[1],
+                reverse=True
+            )[:self.k]
+            self._edges[memory_id] = edges
+            for nid, _ in edges:
+                self._incoming.setdefault(nid, set()).add(memory_id)
+            if location is not None:
+                self._locations[memory_id] = location
+
+    def insert(self, memory_id: str, candidates: Iterable[Tuple[str, float]],
+               location: Optional[str] = None) -> Set[str]:
+        """
+        Add or re-link a node
+
+        Args:
+            memory_id: Node to insert
+            candidates: (ID, similarity) pairs for nearby memories
+            location: Name of the collection holding the node
+
+        Returns:
+            IDs whose edge lists changed (including memory_id)
+        """
+        with self._lock:
+            self.set_edges(memory_id, candidates, location)
+            changed = {memory_id}
+            for nid, score in self._edges[memory_id]:
+                if self._offer(nid, memory_id, score):
+                    changed.add(nid)
+            return changed
+
+    def _offer(self, node: str, candidate: str, score: float) -> bool:
+        """Add candidate to node's edges if it beats the weakest one (caller holds the lock)"""
+        edges = self._edges.get(node)
+        if edges is None or any(nid == candidate for nid, _ in edges):
+            return False
+        if len(edges) >= self.k and score <= edges[-1][1]:
+            return False
+
+        edges.append((candidate, score))
+        edges.sort(key=lambda x: x[1], reverse=True)
+        self._incoming.setdefault(candidate, set()).add(node)
+        if len(edges) > self.k:
+            dropped, _ = edges.pop()
+            self._incoming.get(dropped, set()).discard(node)
+        return True
+
+    def remove(self, memory_id: str) -> Set[str]:
+        """
+        Remove a node and every edge pointing at it
+
+        Returns:
+            IDs of remaining nodes whose edge lists changed
+        """
+        with self._lock:
+            self._locations.pop(memory_id, None)
+            for nid, _ in self._edges.pop(memory_id, []):
+                self._incoming.get(nid, set()).discard(memory_id)
+
+            changed = set()
+            for source in self._incoming.pop(memory_id, set()):
+                edges = self._edges.get(source)
+                if edges is not None:
+                    self._edges[source] = [(nid, s) for nid, s in edges if nid != memory_id]
+                    changed.add(source)
+            return changed
+
+    def clear(self):
+        """Drop all nodes and edges"""
+        with self._lock:
+            self._edges.clear()
+            self._incoming.clear()
+            self._locations.clear()
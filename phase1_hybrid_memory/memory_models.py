@@ -42,6 +42,8 @@ class MemoryMetadata:
     source: str = "user_conversation"
     tier: MemoryTier = MemoryTier.TIER_1_ACTIVE
     related_memories: List[str] = field(default_factory=list)  # UUIDs
+    token_count: Optional[int] = None  # Cached at write time
+    namespace: Optional[str] = None  # Tenant/agent shard key; None = shared
     
 
 @dataclass
@@ -69,7 +71,9 @@ class MemoryEntry:
                 "tags": self.metadata.tags,
                 "source": self.metadata.source,
                 "tier": self.metadata.tier.value,
-                "related_memories": self.metadata.related_memories
+                "related_memories": self.metadata.related_memories,
+                "token_count": self.metadata.token_count,
+                "namespace": self.metadata.namespace
             }
         }
     
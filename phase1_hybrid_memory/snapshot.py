@@ -0,0 +1,315 @@
+"""
+Snapshot Export and Import
+Columnar on-disk snapshots of a VectorStore for backup, cloning and
+read-only search replicas
+
+Layout of a snapshot directory:
+- manifest.json: format version, row count, embedding dimension
+- embeddings.npy: (n, dim) float32 matrix, memory-mappable
+- tier.npy: int8 tier code per row (0 = Tier 1, 1 = Tier 2)
+- ids / content / metadata: UTF-8 blob (.bin) plus int64 offsets (.offsets.npy)
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import json
+import numpy as np
+from .memory_models import MemoryEntry, MemoryTier
+from .vector_store import VectorStore
+from .embedding_generator import get_embedding_generator
+
+SNAPSHOT_FORMAT = "memoryforge-snapshot"
+SNAPSHOT_VERSION = 1
+
+TIER_CODES = {MemoryTier.TIER_1_ACTIVE: 0, MemoryTier.TIER_2_PERSISTENT: 1}
+TIERS_BY_CODE = {code: tier for tier, code in TIER_CODES.items()}
+
+STRING_COLUMNS = ("ids", "content", "metadata")
+
+
+class _BlobColumnWriter:
+    """Append-only string column: concatenated UTF-8 blob plus row offsets"""
+
+    def __init__(self, directory: Path, name: str, n_rows: int):
+        self._blob = open(directory / f"{name}.bin", "wb")
+        self._offsets = np.lib.format.open_memmap(
+            directory / f"{name}.offsets.npy", mode="w+", dtype=np.int64, shape=(n_rows + 1,)
+        )
+        self._offsets[0] = 0
+        self._position = 0
+
+    def write(self, row: int, values: List[str]):
+        for i, value in enumerate(values):
+            data = value.encode("utf-8")
+            self._blob.write(data)
+            self._position += len(data)
+            self._offsets[row + i + 1] = self._position
+
+    def close(self):
+        self._blob.close()
+        self._offsets.flush()
+        del self._offsets
+
+
+class _BlobColumnReader:
+    """Memory-mapped reader for a string column"""
+
+    def __init__(self, directory: Path, name: str):
+        self._blob = np.memmap(directory / f"{name}.bin", dtype=np.uint8, mode="r") \
+            if (directory / f"{name}.bin").stat().st_size > 0 else np.zeros(0, dtype=np.uint8)
+        self._offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode="r")
+
+    def __getitem__(self, row: int) -> str:
+        start, end = int(self._offsets[row]), int(self._offsets[row + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    def rows(self, start: int, stop: int) -> List[str]:
+        return [self[i] for i in range(start, stop)]
+
+
+def export_snapshot(vector_store: VectorStore, path: str, page_size: int = 1000) -> Dict[str, Any]:
+    """
+    Stream both tiers of a store into a snapshot directory
+
+    Rows are read one page at a time and written straight into memory-mapped
+    columns, so memory use is bounded by page_size regardless of store size.
+
+    Args:
+        vector_store: Store to export
+        path: Target directory (created if missing)
+        page_size: Entries fetched per page
+
+    Returns:
+        The snapshot manifest
+    """
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    sources = [
+        (tier, collection)
+        for tier in (MemoryTier.TIER_1_ACTIVE, MemoryTier.TIER_2_PERSISTENT)
+        for collection in vector_store.get_shards(tier)
+    ]
+    n_rows = sum(collection.count() for _, collection in sources)
+    dim = _probe_dimension(sources)
+
+    if n_rows == 0:
+        # numpy cannot memory-map zero-length arrays
+        np.save(directory / "embeddings.npy", np.zeros((0, dim), dtype=np.float32))
+        np.save(directory / "tier.npy", np.zeros(0, dtype=np.int8))
+        embeddings = tiers = None
+    else:
+        embeddings = np.lib.format.open_memmap(
+            directory / "embeddings.npy", mode="w+", dtype=np.float32, shape=(n_rows, dim)
+        )
+        tiers = np.lib.format.open_memmap(
+            directory / "tier.npy", mode="w+", dtype=np.int8, shape=(n_rows,)
+        )
+    writers = {name: _BlobColumnWriter(directory, name, n_rows) for name in STRING_COLUMNS}
+
+    row = 0
+    for tier, collection in sources:
+        offset = 0
+        while row < n_rows:
+            page = collection.get(
+                limit=min(page_size, n_rows - row),
+                offset=offset,
+                include=["embeddings", "documents", "metadatas"]
+            )
+            if not page.get("ids"):
+                break
+
+            count = len(page["ids"])
+            embeddings[row:row + count] = np.asarray(page["embeddings"], dtype=np.float32)
+            tiers[row:row + count] = TIER_CODES[tier]
+            writers["ids"].write(row, page["ids"])
+            writers["content"].write(row, page["documents"])
+            writers["metadata"].write(row, [json.dumps(m) for m in page["metadatas"]])
+
+            row += count
+            offset += count
+
+    if embeddings is not None:
+        embeddings.flush()
+        tiers.flush()
+    del embeddings, tiers
+    for writer in writers.values():
+        writer.close()
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "count": row,
+        "dim": dim,
+        "embedding_model": vector_store.embedding_gen.model_name,
+        "created_at": datetime.now().isoformat(),
+    }
+    with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+def _probe_dimension(sources) -> int:
+    """Embedding dimension of the first stored record, 0 if the store is empty"""
+    for _, collection in sources:
+        page = collection.get(limit=1, include=["embeddings"])
+        if page.get("ids"):
+            return len(page["embeddings"][0])
+    return 0
+
+
+def _read_manifest(directory: Path) -> Dict[str, Any]:
+    """Load and validate a snapshot manifest"""
+    with open(directory / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Not a snapshot directory: {directory}")
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+    return manifest
+
+
+def import_snapshot(path: str, vector_store: VectorStore, batch_size: int = 1000) -> int:
+    """
+    Bulk-load a snapshot into a store without re-embedding
+
+    Args:
+        path: Snapshot directory
+        vector_store: Target store (normally fresh)
+        batch_size: Records added per collection call
+
+    Returns:
+        Number of records loaded
+    """
+    directory = Path(path)
+    manifest = _read_manifest(directory)
+    n_rows = manifest["count"]
+    if n_rows == 0:
+        return 0
+
+    embeddings = np.load(directory / "embeddings.npy", mmap_mode="r")
+    tiers = np.load(directory / "tier.npy", mmap_mode="r")
+    readers = {name: _BlobColumnReader(directory, name) for name in STRING_COLUMNS}
+
+    loaded = 0
+    for start in range(0, n_rows, batch_size):
+        stop = min(start + batch_size, n_rows)
+        ids = readers["ids"].rows(start, stop)
+        documents = readers["content"].rows(start, stop)
+        metadatas = [json.loads(m) for m in readers["metadata"].rows(start, stop)]
+        block = np.asarray(embeddings[start:stop])
+        block_tiers = np.asarray(tiers[start:stop])
+
+        for code, tier in TIERS_BY_CODE.items():
+            rows = np.flatnonzero(block_tiers == code)
+            if len(rows) == 0:
+                continue
+            loaded += vector_store.bulk_load(
+                tier,
+                ids=[ids[i] for i in rows],
+                embeddings=block[rows].tolist(),
+                documents=[documents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows]
+            )
+
+    return loaded
+
+
+class SnapshotReplica:
+    """Read-only search replica served directly from a memory-mapped snapshot"""
+
+    def __init__(self, path: str, block_size: int = 65536):
+        """
+        Open a snapshot for searching
+
+        Args:
+            path: Snapshot directory
+            block_size: Rows scored per block during search
+        """
+        self.path = Path(path)
+        self.manifest = _read_manifest(self.path)
+        self.block_size = block_size
+        self.embedding_gen = get_embedding_generator(self.manifest["embedding_model"])
+
+        if self.manifest["count"] > 0:
+            self.embeddings = np.load(self.path / "embeddings.npy", mmap_mode="r")
+            self.tiers = np.load(self.path / "tier.npy", mmap_mode="r")
+        else:
+            self.embeddings = np.zeros((0, self.manifest["dim"]), dtype=np.float32)
+            self.tiers = np.zeros(0, dtype=np.int8)
+        self._columns = {name: _BlobColumnReader(self.path, name) for name in STRING_COLUMNS}
+
+    def __len__(self) -> int:
+        return self.manifest["count"]
+
+    def search(self, query: str, tier: Optional[MemoryTier] = None,
+               limit: int = 10, min_score: float = 0.5) -> List[Tuple[MemoryEntry, float]]:
+        """
+        Semantic search over the snapshot
+
+        Scores use the same 1 / (1 + squared L2 distance) convention as
+        VectorStore.search, so results are comparable with the live store.
+
+        Args:
+            query: Search query text
+            tier: Optional tier filter
+            limit: Maximum results to return
+            min_score: Minimum similarity score (0 to 1)
+
+        Returns:
+            List of (MemoryEntry, similarity_score) tuples
+        """
+        if len(self) == 0 or limit <= 0:
+            return []
+        return self.search_by_embedding(self.embedding_gen.generate(query), tier, limit, min_score)
+
+    def search_by_embedding(self, query_embedding: List[float], tier: Optional[MemoryTier] = None,
+                            limit: int = 10, min_score: float = 0.5) -> List[Tuple[MemoryEntry, float]]:
+        """Search with a precomputed query embedding (see search)"""
+        if len(self) == 0 or limit <= 0:
+            return []
+
+        query_vec = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(query_vec @ query_vec)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_dist = np.empty(0, dtype=np.float32)
+        for start in range(0, len(self), self.block_size):
+            block = np.asarray(self.embeddings[start:min(start + self.block_size, len(self))])
+            distances = (
+                np.einsum("ij,ij->i", block, block) - 2.0 * (block @ query_vec) + query_norm
+            )
+            if tier is not None:
+                mask = np.asarray(self.tiers[start:start + len(block)]) != TIER_CODES[tier]
+                distances[mask] = np.inf
+
+            rows = np.arange(start, start + len(block))
+            best_rows = np.concatenate([best_rows, rows])
+            best_dist = np.concatenate([best_dist, distances.astype(np.float32)])
+            if len(best_dist) > limit:
+                top = np.argpartition(best_dist, limit - 1)[:limit]
+                best_rows, best_dist = best_rows[top], best_dist[top]
+
+        order = np.argsort(best_dist)
+        results = []
+        for row, distance in zip(best_rows[order], best_dist[order]):
+            if not np.isfinite(distance):
+                continue
+            similarity = 1.0 / (1.0 + max(float(distance), 0.0))
+            if similarity >= min_score:
+                results.append((self.get_entry(int(row)), similarity))
+
+        return results
+
+    def get_entry(self, row: int) -> MemoryEntry:
+        """Materialize a single snapshot row as a MemoryEntry"""
+        metadata_dict = json.loads(self._columns["metadata"][row])
+        return MemoryEntry(
+            id=self._columns["ids"][row],
+            content=self._columns["content"][row],
+            summary=metadata_dict.get("summary") or None,
+            embedding=np.asarray(self.embeddings[row]).tolist(),
+            metadata=VectorStore._parse_metadata(metadata_dict)
+        )
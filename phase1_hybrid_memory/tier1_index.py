@@ -0,0 +1,250 @@
+"""
+In-Memory Tier 1 Index
+RAM-resident engine for active memory: a contiguous normalized float32
+matrix searched with a single matrix-vector product
+"""
+
+from typing import List, Dict, Optional, Tuple
+from dataclasses import replace
+import threading
+import numpy as np
+from .memory_models import MemoryEntry, MemoryMetadata
+
+
+class Tier1Index:
+    """Exact cosine top-k over Tier 1 entries held in process memory
+
+    Rows live in a preallocated matrix that doubles when full. Deleted rows
+    go on a free-slot list and are reused by the next insert, so add and
+    remove are O(1) and the matrix never needs compacting. Entries are
+    cached as MemoryEntry objects, so a recall returns them without any
+    conversion; callers should treat returned entries as read-only.
+    """
+
+    def __init__(self, dim: Optional[int] = None, initial_capacity: int = 1024):
+        """
+        Initialize index
+
+        Args:
+            dim: Embedding dimension (inferred from the first entry if omitted)
+            initial_capacity: Rows preallocated before the first resize
+        """
+        self.dim = dim
+        self._capacity = max(1, initial_capacity)
+        self._matrix: Optional[np.ndarray] = None
+        self._norms = np.zeros(self._capacity, dtype=np.float32)
+        self._valid = np.zeros(self._capacity, dtype=bool)
+        self._ns_codes = np.zeros(self._capacity, dtype=np.int32)
+        self._namespaces: Dict[Optional[str], int] = {None: 0}
+        self._entries: List[Optional[MemoryEntry]] = [None] * self._capacity
+        self._slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._size = 0  # high-water mark of used rows
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, memory_id: str) -> bool:
+        return memory_id in self._slots
+
+    def _grow(self):
+        """Double row capacity"""
+        new_capacity = self._capacity * 2
+        matrix = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        matrix[:self._capacity] = self._matrix
+        self._matrix = matrix
+        self._norms = np.resize(self._norms, new_capacity)
+        self._valid = np.concatenate([self._valid, np.zeros(self._capacity, dtype=bool)])
+        self._ns_codes = np.resize(self._ns_codes, new_capacity)
+        self._entries.extend([None] * self._capacity)
+        self._capacity = new_capacity
+
+    def add(self, entry: MemoryEntry):
+        """
+        Insert or replace an entry
+
+        Args:
+            entry: Memory entry with an embedding
+        """
+        if entry.embedding is None:
+            raise ValueError(f"Entry {entry.id} has no embedding")
+
+        vector = np.asarray(entry.embedding, dtype=np.float32)
+        with self._lock:
+            if self._matrix is None:
+                self.dim = self.dim or vector.shape[0]
+                self._matrix = np.zeros((self._capacity, self.dim), dtype=np.float32)
+            if vector.shape[0] != self.dim:
+                raise ValueError(f"Expected embedding dimension {self.dim}, got {vector.shape[0]}")
+
+            slot = self._slots.get(entry.id)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    if self._size == self._capacity:
+                        self._grow()
+                    slot = self._size
+                    self._size += 1
+
+            norm = float(np.linalg.norm(vector))
+            self._matrix[slot] = vector / norm if norm > 0 else vector
+            self._norms[slot] = norm
+            self._valid[slot] = True
+            self._ns_codes[slot] = self._namespace_code(entry.metadata.namespace)
+            self._entries[slot] = replace(entry, metadata=replace(entry.metadata))
+            self._slots[entry.id] = slot
+
+    def remove(self, memory_id: str) -> bool:
+        """Remove an entry, returning its slot to the free list"""
+        with self._lock:
+            slot = self._slots.pop(memory_id, None)
+            if slot is None:
+                return False
+            self._valid[slot] = False
+            self._entries[slot] = None
+            self._free.append(slot)
+            return True
+
+    def get(self, memory_id: str) -> Optional[MemoryEntry]:
+        """Cached entry by ID"""
+        slot = self._slots.get(memory_id)
+        return self._entries[slot] if slot is not None else None
+
+    def refresh(self, memory_id: str, content: str, summary: Optional[str],
+                metadata: MemoryMetadata) -> bool:
+        """
+        Rebuild a cached entry from its updated record, keeping the embedding
+
+        Args:
+            memory_id: Entry to refresh
+            content: Stored document text
+            summary: Stored summary (None if the entry has none)
+            metadata: Parsed stored metadata
+
+        Returns:
+            Whether the entry was cached
+        """
+        with self._lock:
+            slot = self._slots.get(memory_id)
+            if slot is None:
+                return False
+            self._entries[slot] = replace(
+                self._entries[slot], content=content, summary=summary, metadata=metadata
+            )
+            self._ns_codes[slot] = self._namespace_code(metadata.namespace)
+            return True
+
+    def set_related(self, memory_id: str, related_memories: List[str]) -> bool:
+        """Replace the cached related_memories of an entry"""
+        with self._lock:
+            slot = self._slots.get(memory_id)
+            if slot is None:
+                return False
+            entry = self._entries[slot]
+            self._entries[slot] = replace(
+                entry, metadata=replace(entry.metadata, related_memories=list(related_memories))
+            )
+            return True
+
+    def _namespace_code(self, namespace: Optional[str]) -> int:
+        if namespace not in self._namespaces:
+            self._namespaces[namespace] = len(self._namespaces)
+        return self._namespaces[namespace]
+
+    def _live_mask(self, namespace: Optional[str], exact: bool = False) -> np.ndarray:
+        """Rows that are occupied and in the namespace (None: any, unless exact)"""
+        mask = self._valid[:self._size].copy()
+        if namespace is not None or exact:
+            code = self._namespaces.get(namespace)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= self._ns_codes[:self._size] == code
+        return mask
+
+    def cosine(self, query_embedding: List[float],
+               namespace: Optional[str] = None) -> Tuple[List[MemoryEntry], np.ndarray]:
+        """
+        Cosine similarity of the query to every live entry
+
+        Returns:
+            Tuple of (entries, similarities) in matching order
+        """
+        with self._lock:
+            if self._matrix is None or not self._slots:
+                return [], np.zeros(0, dtype=np.float32)
+
+            query = np.asarray(query_embedding, dtype=np.float32)
+            query_norm = float(np.linalg.norm(query))
+            rows = np.flatnonzero(self._live_mask(namespace))
+            if query_norm == 0:
+                scores = np.zeros(len(rows), dtype=np.float32)
+            else:
+                scores = self._matrix[rows] @ (query / query_norm)
+            return [self._entries[i] for i in rows], scores
+
+    def search(self, query_embedding: List[float], limit: int = 10, min_score: float = 0.0,
+               namespace: Optional[str] = None,
+               exact_namespace: bool = False) -> List[Tuple[MemoryEntry, float]]:
+        """
+        Exact top-k search
+
+        Rows are ranked by cosine similarity. Scores are reported on the
+        VectorStore scale, 1 / (1 + squared L2 distance), computed from the
+        cosine and the stored vector norms, so results merge cleanly with
+        Tier 2 hits.
+
+        Args:
+            query_embedding: Query embedding
+            limit: Maximum results to return
+            min_score: Minimum similarity score (0 to 1)
+            namespace: Only return entries in this namespace
+            exact_namespace: Treat namespace=None as "no namespace" rather
+                than "any namespace"
+
+        Returns:
+            List of (MemoryEntry, similarity_score) tuples
+        """
+        with self._lock:
+            if self._matrix is None or not self._slots or limit <= 0:
+                return []
+
+            query = np.asarray(query_embedding, dtype=np.float32)
+            query_norm = float(np.linalg.norm(query))
+            if query_norm == 0:
+                return []
+
+            cosine = self._matrix[:self._size] @ (query / query_norm)
+            mask = self._live_mask(namespace, exact_namespace)
+            cosine[~mask] = -np.inf
+
+            k = min(limit, int(mask.sum()))
+            if k == 0:
+                return []
+            top = np.argpartition(-cosine, k - 1)[:k]
+            top = top[np.argsort(-cosine[top])]
+
+            norms = self._norms[top]
+            distances = norms ** 2 + query_norm ** 2 - 2.0 * norms * query_norm * cosine[top]
+            similarities = 1.0 / (1.0 + np.maximum(distances, 0.0))
+
+            return [
+                (self._entries[i], float(score))
+                for i, score in zip(top, similarities)
+                if score >= min_score
+            ]
+
+    def entries(self, namespace: Optional[str] = None) -> List[MemoryEntry]:
+        """All cached entries (optionally limited to a namespace)"""
+        with self._lock:
+            return [self._entries[i] for i in np.flatnonzero(self._live_mask(namespace))]
+
+    def clear(self):
+        """Drop all entries, keeping allocated capacity"""
+        with self._lock:
+            self._valid[:] = False
+            self._entries = [None] * self._capacity
+            self._slots.clear()
+            self._free.clear()
+            self._size = 0
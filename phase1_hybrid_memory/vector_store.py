@@ -5,22 +5,56 @@ Persistent storage for memory embeddings and semantic search
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import heapq
+import itertools
 import json
+import re
+import threading
 from .memory_models import MemoryEntry, MemoryMetadata, MemoryTier
 from .embedding_generator import get_embedding_generator
+from .cluster_index import ClusterIndex
+from .tier1_index import Tier1Index
+from .memory_graph import MemoryGraph
 
 
-class VectorStore:
-    """ChromaDB-based vector storage for memory system"""
+TIER_COLLECTIONS = {
+    MemoryTier.TIER_1_ACTIVE: "tier1_active_memory",
+    MemoryTier.TIER_2_PERSISTENT: "tier2_persistent_memory",
+}
+CLUSTER_COLLECTION = "tier2_cluster_centroids"
+SHARD_SEPARATOR = "__"
+
 
-    def __init__(self, persist_directory: str = "./chroma_db"):
+class VectorStore:
+    """ChromaDB-based vector storage for memory system
+
+    Entries without a namespace live in the two base collections. Namespaced
+    entries are routed to per-tier shard collections, either one shard per
+    namespace or, when n_shards is set, one of n_shards hash buckets. Every
+    Tier 2 collection has its own cluster index. Point operations (update,
+    delete, archive) take the entry's namespace and look in its shards
+    first, scanning every shard only if the entry is not found there.
+    """
+
+    def __init__(self, persist_directory: str = "./chroma_db",
+                 n_shards: Optional[int] = None, max_workers: Optional[int] = None,
+                 graph_k: int = 0):
         """
         Initialize vector store
 
         Args:
             persist_directory: Directory for persistent storage
+            n_shards: Hash namespaces into this many shards per tier
+                (default: one shard per namespace)
+            max_workers: Thread pool size for fan-out search
+            graph_k: Neighbours kept per memory in the related-memory graph.
+                Linking costs a search per write, so it is opt-in: 0 (the
+                default) skips it, and rebuild_graph links a store in batch
+                (memories added after a rebuild stay unlinked until the next)
         """
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
@@ -43,7 +77,176 @@ class VectorStore:
             metadata={"description": "Long-term persistent memory"}
         )
 
+        self.tier2_clusters = ClusterIndex(self.client.get_or_create_collection(
+            name=CLUSTER_COLLECTION,
+            metadata={"description": "Tier 2 cluster centroids and summaries"}
+        ))
+        self._cluster_indexes: Dict[str, ClusterIndex] = {}
+
+        self.n_shards = n_shards
+        self.max_workers = max_workers
+        self._shards: Dict[str, Any] = {}
+        self._shards_lock = threading.RLock()
+        self._load_shards()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
         self.embedding_gen = get_embedding_generator()
+        self._tier1_tokens: Optional[Dict[str, int]] = None
+        self._tier1_token_total = 0
+        self._ledger_lock = threading.RLock()
+        self._tier1_index: Optional[Tier1Index] = None
+        self._tier1_lock = threading.RLock()
+        self.graph_k = graph_k
+        self._graph: Optional[MemoryGraph] = None
+        self._graph_lock = threading.Lock()
+
+    @property
+    def graph(self) -> MemoryGraph:
+        """
+        Related-memory k-NN graph
+
+        Edges are stored in each entry's metadata (related_memories plus
+        related_scores) and loaded into memory on first use. Stored edge
+        lists are kept whole, even if they are longer than graph_k (as after
+        rebuild_graph with a larger k).
+        """
+        with self._graph_lock:
+            if self._graph is None:
+                nodes = []
+                for collection in self._all_collections():
+                    results = collection.get(include=["metadatas"])
+                    for memory_id, metadata in zip(results.get("ids") or [], results.get("metadatas") or []):
+                        nodes.append((memory_id, collection.name, list(zip(
+                            json.loads(metadata.get("related_memories", "[]")),
+                            json.loads(metadata.get("related_scores", "[]"))
+                        ))))
+
+                graph = MemoryGraph(k=max([self.graph_k] + [len(edges) for _, _, edges in nodes]))
+                for memory_id, location, edges in nodes:
+                    graph.set_edges(memory_id, edges, location=location)
+                self._graph = graph
+            return self._graph
+
+    @property
+    def tier1_index(self) -> Tier1Index:
+        """
+        RAM-resident Tier 1 engine
+
+        Loaded from the Tier 1 collections on first use. Writes go through to
+        ChromaDB first and are then applied to the index, so the collections
+        stay the source of truth and the index can always be rebuilt. The
+        load holds the same lock as the write-through, so a write that lands
+        in ChromaDB during the load is still applied to the loaded index.
+        """
+        with self._tier1_lock:
+            if self._tier1_index is None:
+                index = Tier1Index()
+                for collection in self.get_shards(MemoryTier.TIER_1_ACTIVE):
+                    results = collection.get(include=["documents", "metadatas", "embeddings"])
+                    for entry in self._entries_from_results(results):
+                        index.add(entry)
+                self._tier1_index = index
+            return self._tier1_index
+
+    def _tier1_write_through(self, apply: Callable[[Tier1Index], Any]):
+        """Apply a write to the Tier 1 index, if it is loaded"""
+        with self._tier1_lock:
+            if self._tier1_index is not None:
+                apply(self._tier1_index)
+
+    def _drop_caches(self, tier1: bool = True):
+        """Forget the in-memory graph (and Tier 1 index) so they reload from ChromaDB"""
+        if tier1:
+            with self._tier1_lock:
+                self._tier1_index = None
+        with self._graph_lock:
+            self._graph = None
+
+    def _load_shards(self):
+        """Discover existing shard collections"""
+        prefixes = tuple(base + SHARD_SEPARATOR for base in TIER_COLLECTIONS.values())
+        with self._shards_lock:
+            for collection in self.client.list_collections():
+                name = getattr(collection, "name", collection)
+                if name.startswith(prefixes):
+                    self._shards[name] = self.client.get_collection(name)
+
+    def shard_name(self, tier: MemoryTier, namespace: Optional[str]) -> str:
+        """Collection name holding a namespace's entries for a tier"""
+        base = TIER_COLLECTIONS[tier]
+        if namespace is None:
+            return base
+
+        digest = hashlib.sha1(namespace.encode()).hexdigest()
+        if self.n_shards:
+            return f"{base}{SHARD_SEPARATOR}shard{int(digest, 16) % self.n_shards:03d}"
+
+        slug = re.sub(r"[^a-zA-Z0-9_-]", "-", namespace)[:20]
+        return f"{base}{SHARD_SEPARATOR}ns-{slug}-{digest[:8]}"
+
+    def _get_collection(self, tier: MemoryTier, namespace: Optional[str], create: bool = True):
+        """Collection for a tier and namespace, created on first write"""
+        if namespace is None:
+            return self.tier1_collection if tier == MemoryTier.TIER_1_ACTIVE else self.tier2_collection
+
+        name = self.shard_name(tier, namespace)
+        with self._shards_lock:
+            if name not in self._shards:
+                if not create:
+                    return None
+                self._shards[name] = self.client.get_or_create_collection(
+                    name=name,
+                    metadata={"description": f"{tier.value} shard", "tier": tier.value}
+                )
+            return self._shards[name]
+
+    def get_shards(self, tier: MemoryTier, namespace: Optional[str] = None) -> List[Any]:
+        """
+        Collections to read for a tier
+
+        Args:
+            tier: Memory tier
+            namespace: Restrict to this namespace's shard (default: all shards)
+
+        Returns:
+            List of ChromaDB collections
+        """
+        if namespace is not None:
+            collection = self._get_collection(tier, namespace, create=False)
+            return [collection] if collection is not None else []
+
+        base = self.tier1_collection if tier == MemoryTier.TIER_1_ACTIVE else self.tier2_collection
+        prefix = TIER_COLLECTIONS[tier] + SHARD_SEPARATOR
+        with self._shards_lock:
+            shards = sorted(self._shards.items())
+        return [base] + [c for name, c in shards if name.startswith(prefix)]
+
+    def cluster_index_for(self, collection) -> ClusterIndex:
+        """
+        Cluster index of a Tier 2 collection
+
+        Shard indexes are stored in a centroid collection named after the
+        shard (tier2_persistent_memory__x -> tier2_cluster_centroids__x) and
+        loaded on first use.
+        """
+        if collection is self.tier2_collection:
+            return self.tier2_clusters
+
+        name = collection.name
+        with self._shards_lock:
+            if name not in self._cluster_indexes:
+                self._cluster_indexes[name] = ClusterIndex(self.client.get_or_create_collection(
+                    name=name.replace(TIER_COLLECTIONS[MemoryTier.TIER_2_PERSISTENT], CLUSTER_COLLECTION, 1),
+                    metadata={"description": f"Cluster centroids for {name}"}
+                ))
+            return self._cluster_indexes[name]
+
+    def _namespace_filter(self, namespace: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Where clause isolating a namespace inside a hash-bucket shard"""
+        if namespace is None or not self.n_shards:
+            return None
+        return {"namespace": namespace}
 
     def add_memory(self, entry: MemoryEntry) -> str:
         """
@@ -59,8 +262,17 @@ class VectorStore:
             content_to_embed = entry.summary if entry.summary else entry.content
             entry.embedding = self.embedding_gen.generate(content_to_embed)
 
-        collection = (self.tier1_collection if entry.metadata.tier == MemoryTier.TIER_1_ACTIVE
-                     else self.tier2_collection)
+        if entry.metadata.token_count is None:
+            entry.metadata.token_count = self.embedding_gen.count_tokens(entry.content)
+
+        collection = self._get_collection(entry.metadata.tier, entry.metadata.namespace)
+
+        changed_edges = set()
+        if self.graph_k > 0:
+            changed_edges = self.graph.insert(
+                entry.id, self._graph_candidates(entry), location=collection.name
+            )
+            entry.metadata.related_memories = self.graph.neighbors(entry.id)
 
         metadata = {
             "created_at": entry.metadata.created_at.isoformat(),
@@ -70,8 +282,18 @@ class VectorStore:
             "topics": json.dumps(entry.metadata.topics),
             "tags": json.dumps(entry.metadata.tags),
             "has_summary": entry.summary is not None,
-            "summary": entry.summary or ""
+            "summary": entry.summary or "",
+            "token_count": entry.metadata.token_count,
+            "related_memories": json.dumps(entry.metadata.related_memories)
         }
+        if self.graph_k > 0:
+            metadata["related_scores"] = json.dumps([score for _, score in self.graph.edges(entry.id)])
+        if entry.metadata.namespace is not None:
+            metadata["namespace"] = entry.metadata.namespace
+
+        if entry.metadata.tier == MemoryTier.TIER_2_PERSISTENT:
+            cluster_id = self.cluster_index_for(collection).assign(entry.embedding)
+            metadata[ClusterIndex.CLUSTER_KEY] = cluster_id or ClusterIndex.UNASSIGNED
 
         collection.add(
             ids=[entry.id],
@@ -80,68 +302,322 @@ class VectorStore:
             metadatas=[metadata]
         )
 
+        if entry.metadata.tier == MemoryTier.TIER_1_ACTIVE:
+            self._ledger_set(entry.id, entry.metadata.token_count)
+            self._tier1_write_through(lambda index: index.add(entry))
+
+        self._persist_edges(changed_edges - {entry.id})
         return entry.id
 
+    def _graph_candidates(self, entry: MemoryEntry) -> List[Tuple[str, float]]:
+        """
+        Nearest stored memories in the entry's namespace, scored by cosine
+
+        Only the namespace's own Tier 1 entries and Tier 2 collection are
+        searched, so other tenants' shards are never touched.
+        """
+        namespace = entry.metadata.namespace
+        limit = self.graph_k + 1
+        hits = self.tier1_index.search(
+            entry.embedding, limit, 0.0, namespace=namespace, exact_namespace=True
+        )
+        tier2 = self._get_collection(MemoryTier.TIER_2_PERSISTENT, namespace, create=False)
+        if tier2 is not None:
+            hits += self._search_tier2(
+                tier2, entry.embedding, limit, 0.0, n_probe=4, where=self._namespace_filter(namespace)
+            )
+
+        hits = [
+            hit for hit, _ in heapq.nlargest(limit, hits, key=lambda x: x[1])
+            if hit.id != entry.id and hit.embedding is not None
+        ]
+        if not hits:
+            return []
+
+        scores = self.embedding_gen.batch_similarity(entry.embedding, [hit.embedding for hit in hits])
+        return [(hit.id, float(score)) for hit, score in zip(hits, scores)]
+
+    def _persist_edges(self, memory_ids):
+        """
+        Write the current edge lists of the given memories to their metadata
+
+        One partial update per collection; ChromaDB merges the edge keys into
+        the existing metadata.
+        """
+        by_collection: Dict[str, Tuple[List[str], List[Dict[str, Any]]]] = {}
+        for memory_id in memory_ids:
+            location = self.graph.location(memory_id)
+            if location is None:
+                continue
+            edges = self.graph.edges(memory_id)
+            related = [nid for nid, _ in edges]
+            ids, metadatas = by_collection.setdefault(location, ([], []))
+            ids.append(memory_id)
+            metadatas.append({
+                "related_memories": json.dumps(related),
+                "related_scores": json.dumps([score for _, score in edges])
+            })
+            self._tier1_write_through(lambda index: index.set_related(memory_id, related))
+
+        for name, (ids, metadatas) in by_collection.items():
+            collection = self._collection_named(name)
+            if collection is not None:
+                collection.update(ids=ids, metadatas=metadatas)
+
+    def _collection_named(self, name: str):
+        """Memory collection by name (base or shard)"""
+        if name == self.tier1_collection.name:
+            return self.tier1_collection
+        if name == self.tier2_collection.name:
+            return self.tier2_collection
+        with self._shards_lock:
+            return self._shards.get(name)
+
+    def get_related(self, memory_id: str, limit: Optional[int] = None) -> List[MemoryEntry]:
+        """
+        Memories linked to a memory in the related-memory graph
+
+        A single graph lookup: no embedding or semantic search is involved.
+        Tier 1 neighbours come from the in-memory index, the rest are fetched
+        by ID.
+
+        Args:
+            memory_id: Memory whose neighbours to return
+            limit: Maximum neighbours to return
+
+        Returns:
+            Related entries, most similar first
+        """
+        neighbor_ids = self.graph.neighbors(memory_id)[:limit]
+        found = {}
+        missing = []
+        for nid in neighbor_ids:
+            cached = self.tier1_index.get(nid)
+            if cached is not None:
+                found[nid] = cached
+            else:
+                missing.append(nid)
+
+        if missing:
+            for collection in self.get_shards(MemoryTier.TIER_2_PERSISTENT):
+                results = collection.get(ids=missing, include=["documents", "metadatas", "embeddings"])
+                for entry in self._entries_from_results(results):
+                    found[entry.id] = entry
+
+        return [found[nid] for nid in neighbor_ids if nid in found]
+
+    def rebuild_graph(self, k: Optional[int] = None, block_size: int = 1024) -> int:
+        """
+        Rebuild the whole related-memory graph with a blocked all-pairs k-NN
+
+        Intended after bulk loads, where per-insert linking would cost one
+        search per record, and as the batch alternative to per-write linking
+        when graph_k is 0. Memories are only linked within their namespace.
+        With graph_k at 0, memories added afterwards are not linked until the
+        graph is rebuilt again.
+
+        Args:
+            k: Neighbours per memory (default: graph_k)
+            block_size: Rows scored per block
+
+        Returns:
+            Number of memories linked
+
+        Raises:
+            ValueError: If k (or graph_k, when k is not given) is not positive
+        """
+        k = self.graph_k if k is None else k
+        if k <= 0:
+            raise ValueError(f"rebuild_graph needs k > 0, got {k} (pass k or set graph_k)")
+        records: Dict[Optional[str], List[Tuple[Any, str, Any]]] = {}
+        for collection in self._all_collections():
+            results = collection.get(include=["metadatas", "embeddings"])
+            if not results.get("ids"):
+                continue
+            for memory_id, metadata, embedding in zip(
+                results["ids"], results["metadatas"], results["embeddings"]
+            ):
+                records.setdefault(metadata.get("namespace"), []).append(
+                    (collection, memory_id, embedding)
+                )
+
+        graph = MemoryGraph(k=k)
+        updates: Dict[int, Tuple[Any, List[str], List[Dict[str, Any]]]] = {}
+        for group in records.values():
+            indices, similarities = self.embedding_gen.knn(
+                [embedding for _, _, embedding in group], k, block_size=block_size
+            )
+            for row, (collection, memory_id, _) in enumerate(group):
+                graph.set_edges(memory_id, [
+                    (group[j][1], float(score)) for j, score in zip(indices[row], similarities[row])
+                ], location=collection.name)
+                edges = graph.edges(memory_id)
+                _, ids, metadatas = updates.setdefault(id(collection), (collection, [], []))
+                ids.append(memory_id)
+                metadatas.append({
+                    "related_memories": json.dumps([nid for nid, _ in edges]),
+                    "related_scores": json.dumps([score for _, score in edges])
+                })
+
+        for collection, ids, metadatas in updates.values():
+            for start in range(0, len(ids), 1000):
+                collection.update(ids=ids[start:start + 1000], metadatas=metadatas[start:start + 1000])
+
+        with self._tier1_lock:
+            self._tier1_index = None  # cached entries hold the old related_memories
+        with self._graph_lock:
+            self._graph = graph
+        return len(graph)
+
     def search(self, query: str, tier: Optional[MemoryTier] = None,
-               limit: int = 10, min_score: float = 0.5) -> List[Tuple[MemoryEntry, float]]:
+               limit: int = 10, min_score: float = 0.5,
+               n_probe: int = 4, namespace: Optional[str] = None) -> List[Tuple[MemoryEntry, float]]:
         """
         Semantic search for memories
 
+        Tier 1 is answered from the in-memory index; every relevant Tier 2
+        shard is queried in parallel on a thread pool and the per-shard top-k
+        lists are merged with a heap.
+
         Args:
             query: Search query text
             tier: Optional tier filter
             limit: Maximum results to return
             min_score: Minimum similarity score (0 to 1)
+            n_probe: Number of Tier 2 clusters to probe first
+            namespace: Only search this namespace (default: all shards)
 
         Returns:
             List of (MemoryEntry, similarity_score) tuples
         """
         query_embedding = self.embedding_gen.generate(query)
+        return self.search_by_embedding(query_embedding, tier, limit, min_score, n_probe, namespace)
+
+    def search_by_embedding(self, query_embedding: List[float], tier: Optional[MemoryTier] = None,
+                            limit: int = 10, min_score: float = 0.5, n_probe: int = 4,
+                            namespace: Optional[str] = None) -> List[Tuple[MemoryEntry, float]]:
+        """Semantic search with a precomputed query embedding (see search)"""
+        where = self._namespace_filter(namespace)
+
+        tiers = [tier] if tier is not None else [MemoryTier.TIER_1_ACTIVE, MemoryTier.TIER_2_PERSISTENT]
+        tasks: List[Callable[[], List[Tuple[MemoryEntry, float]]]] = []
+        if MemoryTier.TIER_1_ACTIVE in tiers:
+            tasks.append(lambda: self.tier1_index.search(query_embedding, limit, min_score, namespace))
+
+        for t in tiers:
+            if t == MemoryTier.TIER_1_ACTIVE:
+                continue
+            for collection in self.get_shards(t, namespace):
+                tasks.append(lambda c=collection: self._search_tier2(
+                    c, query_embedding, limit, min_score, n_probe, where
+                ))
 
-        collections = []
-        if tier is None:
-            collections = [self.tier1_collection, self.tier2_collection]
-        elif tier == MemoryTier.TIER_1_ACTIVE:
-            collections = [self.tier1_collection]
+        if len(tasks) <= 1:
+            shard_results = [task() for task in tasks]
         else:
-            collections = [self.tier2_collection]
-
-        all_results = []
-        for collection in collections:
-            results = collection.query(
-                query_embeddings=[query_embedding],
-                n_results=limit,
-                include=["documents", "metadatas", "distances", "embeddings"]
-            )
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="vector-search"
+                    )
+            shard_results = list(self._executor.map(lambda task: task(), tasks))
 
-            if results['ids'][0]:
-                for i in range(len(results['ids'][0])):
-                    distance = results['distances'][0][i]
-                    similarity = 1.0 / (1.0 + distance)
-
-                    if similarity >= min_score:
-                        metadata_dict = results['metadatas'][0][i]
-                        summary = metadata_dict.get("summary") or None
-                        entry = MemoryEntry(
-                            id=results['ids'][0][i],
-                            content=results['documents'][0][i],
-                            summary=summary,
-                            embedding=results['embeddings'][0][i] if 'embeddings' in results else None,
-                            metadata=self._parse_metadata(metadata_dict)
-                        )
-                        all_results.append((entry, similarity))
+        return heapq.nlargest(limit, itertools.chain.from_iterable(shard_results), key=lambda x: x[1])
 
-        all_results.sort(key=lambda x: x[1], reverse=True)
-        return all_results[:limit]
+    def _search_tier2(self, collection, query_embedding: List[float], limit: int,
+                      min_score: float, n_probe: int,
+                      where: Optional[Dict[str, Any]] = None) -> List[Tuple[MemoryEntry, float]]:
+        """
+        Search a Tier 2 collection through its cluster index
 
-    def list_tier_entries(self, tier: MemoryTier, limit: Optional[int] = None) -> List[MemoryEntry]:
-        """List entries from a specific tier"""
-        collection = self.tier1_collection if tier == MemoryTier.TIER_1_ACTIVE else self.tier2_collection
-        results = collection.get(
-            limit=limit,
-            include=["documents", "metadatas", "embeddings"]
+        Routes the query to the nearest clusters, widening the probe until
+        the probed clusters hold at least `limit` members, and queries their
+        members together with every entry not yet assigned to a cluster or
+        still labelled with a retired one. Falls back to a full collection
+        query when the index has not been built.
+        """
+        clusters = self.cluster_index_for(collection)
+        if not clusters.is_trained:
+            return self._query_collection(collection, query_embedding, limit, min_score, where=where)
+
+        total_clusters = len(clusters.cluster_ids)
+        probe = min(total_clusters, max(1, n_probe))
+        cluster_ids = clusters.route(query_embedding, probe)
+        while clusters.member_count(cluster_ids) < limit and probe < total_clusters:
+            probe = min(total_clusters, probe * 2)
+            cluster_ids = clusters.route(query_embedding, probe)
+
+        routed = {ClusterIndex.CLUSTER_KEY: {
+            "$in": cluster_ids + [ClusterIndex.UNASSIGNED] + clusters.retired
+        }}
+        return self._query_collection(
+            collection, query_embedding, limit, min_score,
+            where=routed if where is None else {"$and": [where, routed]}
         )
 
+    def _query_collection(self, collection, query_embedding: List[float], n_results: int,
+                          min_score: float, where: Optional[Dict[str, Any]] = None
+                          ) -> List[Tuple[MemoryEntry, float]]:
+        """Query a single collection and convert hits to scored entries"""
+        if collection.count() == 0:
+            return []
+
+        query_kwargs = {}
+        if where is not None:
+            query_kwargs["where"] = where
+
+        results = collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            include=["documents", "metadatas", "distances", "embeddings"],
+            **query_kwargs
+        )
+
+        scored = []
+        if results['ids'][0]:
+            for i in range(len(results['ids'][0])):
+                distance = results['distances'][0][i]
+                similarity = 1.0 / (1.0 + distance)
+
+                if similarity >= min_score:
+                    metadata_dict = results['metadatas'][0][i]
+                    summary = metadata_dict.get("summary") or None
+                    entry = MemoryEntry(
+                        id=results['ids'][0][i],
+                        content=results['documents'][0][i],
+                        summary=summary,
+                        embedding=results['embeddings'][0][i] if 'embeddings' in results else None,
+                        metadata=self._parse_metadata(metadata_dict)
+                    )
+                    scored.append((entry, similarity))
+
+        return scored
+
+    def list_tier_entries(self, tier: MemoryTier, limit: Optional[int] = None,
+                          namespace: Optional[str] = None) -> List[MemoryEntry]:
+        """List entries from a specific tier (all shards unless a namespace is given)"""
+        entries = []
+        for collection in self.get_shards(tier, namespace):
+            remaining = None if limit is None else limit - len(entries)
+            if remaining is not None and remaining <= 0:
+                break
+
+            get_kwargs = {}
+            where = self._namespace_filter(namespace)
+            if where is not None:
+                get_kwargs["where"] = where
+
+            results = collection.get(
+                limit=remaining,
+                include=["documents", "metadatas", "embeddings"],
+                **get_kwargs
+            )
+            entries.extend(self._entries_from_results(results))
+
+        return entries
+
+    def _entries_from_results(self, results: Dict[str, Any]) -> List[MemoryEntry]:
+        """Build entries from a collection.get result"""
         entries = []
         if not results.get("ids"):
             return entries
@@ -153,25 +629,28 @@ class VectorStore:
                 id=results["ids"][i],
                 content=results["documents"][i],
                 summary=summary,
-                embedding=results["embeddings"][i] if results.get("embeddings") else None,
+                embedding=results["embeddings"][i] if results.get("embeddings") is not None else None,
                 metadata=self._parse_metadata(metadata_dict)
             )
             entries.append(entry)
 
         return entries
 
-    def update_memory(self, memory_id: str, updates: Dict[str, Any]) -> bool:
+    def update_memory(self, memory_id: str, updates: Dict[str, Any],
+                      namespace: Optional[str] = None) -> bool:
         """
         Update a memory entry
 
         Args:
             memory_id: Memory ID to update
             updates: Dictionary of fields to update
+            namespace: Namespace the entry was stored under (every shard is
+                searched if it is not found there)
 
         Returns:
             Success status
         """
-        for collection in [self.tier1_collection, self.tier2_collection]:
+        for collection in self._lookup_collections(namespace):
             try:
                 result = collection.get(ids=[memory_id])
                 if result['ids']:
@@ -182,66 +661,239 @@ class VectorStore:
                         ids=[memory_id],
                         metadatas=[current_metadata]
                     )
+                    self._tier1_write_through(lambda index: index.refresh(
+                        memory_id,
+                        content=result['documents'][0],
+                        summary=current_metadata.get("summary") or None,
+                        metadata=self._parse_metadata(current_metadata)
+                    ))
                     return True
             except:
                 continue
 
         return False
 
-    def delete_memory(self, memory_id: str) -> bool:
-        """Delete a memory from the store"""
-        for collection in [self.tier1_collection, self.tier2_collection]:
+    def delete_memory(self, memory_id: str, namespace: Optional[str] = None) -> bool:
+        """
+        Delete a memory from the store (Tier 1 copy first)
+
+        ChromaDB is deleted from first; the ledger and in-memory index only
+        drop the entry once that succeeded, so they never lose an entry the
+        collections still hold. Without the right namespace every shard is
+        searched for the ID.
+        """
+        for collection in self._lookup_collections(namespace):
             try:
-                collection.delete(ids=[memory_id])
-                return True
+                result = collection.get(ids=[memory_id], include=["metadatas"])
+                if result['ids']:
+                    namespace = result['metadatas'][0].get("namespace")
+                    collection.delete(ids=[memory_id])
+                    self._ledger_pop(memory_id)
+                    self._tier1_write_through(lambda index: index.remove(memory_id))
+                    if collection.name.startswith(TIER_COLLECTIONS[MemoryTier.TIER_2_PERSISTENT]):
+                        self.cluster_index_for(collection).release(
+                            result['metadatas'][0].get(ClusterIndex.CLUSTER_KEY)
+                        )
+                    # Only linked records carry related_scores, so graphless
+                    # stores never load the graph here. Archival adds the Tier 2
+                    # copy before deleting the Tier 1 one.
+                    linked = self._graph is not None or "related_scores" in result['metadatas'][0]
+                    if linked and not self._exists(memory_id, namespace):
+                        self._persist_edges(self.graph.remove(memory_id))
+                    return True
             except:
                 continue
         return False
 
-    def move_to_tier2(self, memory_id: str) -> bool:
+    def _exists(self, memory_id: str, namespace: Optional[str] = None) -> bool:
+        """Whether the namespace's collections still hold the memory"""
+        return any(c.get(ids=[memory_id], include=[])['ids'] for c in self._entry_collections(namespace))
+
+    def _entry_collections(self, namespace: Optional[str]) -> List[Any]:
+        """Collections that can hold an entry of the namespace, Tier 1 first"""
+        collections = (self._get_collection(tier, namespace, create=False) for tier in TIER_COLLECTIONS)
+        return [c for c in collections if c is not None]
+
+    def _all_collections(self) -> List[Any]:
+        """Every memory collection, Tier 1 shards first"""
+        return (self.get_shards(MemoryTier.TIER_1_ACTIVE)
+                + self.get_shards(MemoryTier.TIER_2_PERSISTENT))
+
+    def _lookup_collections(self, namespace: Optional[str],
+                            tiers: Tuple[MemoryTier, ...] = tuple(TIER_COLLECTIONS)):
+        """
+        Collections to try for a point operation, lazily
+
+        The namespace's own collections come first, so a correctly addressed
+        lookup stays O(1) in the number of shards; the remaining shards are
+        only scanned if the caller keeps going (the ID was not found there).
+        """
+        own = [c for c in (self._get_collection(t, namespace, create=False) for t in tiers) if c is not None]
+        yield from own
+        seen = {c.name for c in own}
+        for tier in tiers:
+            for collection in self.get_shards(tier):
+                if collection.name not in seen:
+                    yield collection
+
+    def bulk_load(self, tier: MemoryTier, ids: List[str], embeddings: List[List[float]],
+                  documents: List[str], metadatas: List[Dict[str, Any]]) -> int:
+        """
+        Add pre-embedded records straight into a tier collection
+
+        Used for snapshot imports: nothing is re-embedded or re-tokenized.
+        Records are routed to shards by the namespace stored in their
+        metadata. Stale cluster assignments are replaced: Tier 2 records are
+        assigned to the target store's clusters in one batch per shard (or
+        marked unassigned until the index is built), so they are searchable
+        straight away.
+
+        Returns:
+            Number of records added
+        """
+        if not ids:
+            return 0
+
+        by_namespace: Dict[Optional[str], List[int]] = {}
+        for i, metadata in enumerate(metadatas):
+            metadata.pop(ClusterIndex.CLUSTER_KEY, None)
+            by_namespace.setdefault(metadata.get("namespace"), []).append(i)
+
+        for namespace, rows in by_namespace.items():
+            collection = self._get_collection(tier, namespace)
+            if tier == MemoryTier.TIER_2_PERSISTENT:
+                cluster_ids = self.cluster_index_for(collection).assign_many([embeddings[i] for i in rows])
+                for i, cluster_id in zip(rows, cluster_ids):
+                    metadatas[i][ClusterIndex.CLUSTER_KEY] = cluster_id
+
+            collection.add(
+                ids=[ids[i] for i in rows],
+                embeddings=[embeddings[i] for i in rows],
+                documents=[documents[i] for i in rows],
+                metadatas=[metadatas[i] for i in rows]
+            )
+
+        if tier == MemoryTier.TIER_1_ACTIVE:
+            with self._ledger_lock:
+                self._tier1_tokens = None
+        self._drop_caches(tier1=tier == MemoryTier.TIER_1_ACTIVE)
+        return len(ids)
+
+    def move_to_tier2(self, memory_id: str, namespace: Optional[str] = None) -> bool:
         """
         Archive a memory by moving it from Tier 1 to Tier 2
 
         Args:
             memory_id: Memory ID to archive
+            namespace: Namespace the entry was stored under (every Tier 1
+                shard is searched if it is not found there)
 
         Returns:
             Success status
         """
-        result = self.tier1_collection.get(
-            ids=[memory_id],
-            include=["documents", "metadatas", "embeddings"]
-        )
-
-        if not result['ids']:
+        for source in self._lookup_collections(namespace, (MemoryTier.TIER_1_ACTIVE,)):
+            result = source.get(
+                ids=[memory_id],
+                include=["documents", "metadatas", "embeddings"]
+            )
+            if result['ids']:
+                break
+        else:
             return False
 
         metadata = result['metadatas'][0]
+        namespace = metadata.get("namespace")
         metadata['tier'] = MemoryTier.TIER_2_PERSISTENT.value
+        target = self._get_collection(MemoryTier.TIER_2_PERSISTENT, namespace)
+        cluster_id = self.cluster_index_for(target).assign(result['embeddings'][0])
+        metadata[ClusterIndex.CLUSTER_KEY] = cluster_id or ClusterIndex.UNASSIGNED
 
-        self.tier2_collection.add(
+        target.add(
             ids=result['ids'],
             embeddings=result['embeddings'],
             documents=result['documents'],
             metadatas=[metadata]
         )
 
-        self.tier1_collection.delete(ids=[memory_id])
+        source.delete(ids=[memory_id])
+        if self._graph is not None and memory_id in self._graph:
+            self._graph.set_location(memory_id, target.name)
+        self._ledger_pop(memory_id)
+        self._tier1_write_through(lambda index: index.remove(memory_id))
         return True
 
+    def get_tier1_token_counts(self) -> Dict[str, int]:
+        """
+        Cached token count per Tier 1 entry
+
+        Counts are computed once at write time and stored in entry metadata.
+        The ledger is loaded on first use (backfilling entries written before
+        counts were cached) and kept current by add, archive and delete.
+
+        Returns:
+            A copy of the ledger
+        """
+        with self._ledger_lock:
+            return dict(self._load_ledger())
+
+    def get_tier1_token_total(self) -> int:
+        """Total cached tokens across Tier 1 (a running total, O(1) once loaded)"""
+        with self._ledger_lock:
+            self._load_ledger()
+            return self._tier1_token_total
+
+    def _load_ledger(self) -> Dict[str, int]:
+        """Build the ledger and running total if needed (caller holds the lock)"""
+        if self._tier1_tokens is None:
+            ledger = {}
+            for collection in self.get_shards(MemoryTier.TIER_1_ACTIVE):
+                results = collection.get(include=["documents", "metadatas"])
+                for memory_id, document, metadata in zip(
+                    results.get("ids") or [], results.get("documents") or [], results.get("metadatas") or []
+                ):
+                    token_count = metadata.get("token_count")
+                    if token_count is None:
+                        token_count = self.embedding_gen.count_tokens(document)
+                        metadata["token_count"] = token_count
+                        collection.update(ids=[memory_id], metadatas=[metadata])
+                    ledger[memory_id] = token_count
+            self._tier1_tokens = ledger
+            self._tier1_token_total = sum(ledger.values())
+        return self._tier1_tokens
+
+    def _ledger_set(self, memory_id: str, token_count: int):
+        """Record an entry's token count, if the ledger is loaded"""
+        with self._ledger_lock:
+            if self._tier1_tokens is not None:
+                self._tier1_token_total += token_count - self._tier1_tokens.get(memory_id, 0)
+                self._tier1_tokens[memory_id] = token_count
+
+    def _ledger_pop(self, memory_id: str):
+        """Drop an entry from the ledger, if loaded"""
+        with self._ledger_lock:
+            if self._tier1_tokens is not None:
+                self._tier1_token_total -= self._tier1_tokens.pop(memory_id, 0)
+
     def get_stats(self) -> Dict[str, Any]:
         """Get storage statistics"""
-        tier1_count = self.tier1_collection.count()
-        tier2_count = self.tier2_collection.count()
+        tier1_count = sum(c.count() for c in self.get_shards(MemoryTier.TIER_1_ACTIVE))
+        tier2_count = sum(c.count() for c in self.get_shards(MemoryTier.TIER_2_PERSISTENT))
 
         return {
             "tier1_count": tier1_count,
             "tier2_count": tier2_count,
             "total_count": tier1_count + tier2_count,
+            "tier1_tokens": self.get_tier1_token_total(),
+            "tier2_clusters": sum(
+                len(self.cluster_index_for(c).cluster_ids)
+                for c in self.get_shards(MemoryTier.TIER_2_PERSISTENT)
+            ),
+            "shards": len(self._shards),
             "storage_path": str(self.persist_directory)
         }
 
-    def _parse_metadata(self, metadata_dict: Dict[str, Any]) -> MemoryMetadata:
+    @staticmethod
+    def _parse_metadata(metadata_dict: Dict[str, Any]) -> MemoryMetadata:
         """Parse metadata from ChromaDB format"""
         from datetime import datetime
 
@@ -253,6 +905,9 @@ class VectorStore:
 
         metadata.topics = json.loads(metadata_dict.get('topics', '[]'))
         metadata.tags = json.loads(metadata_dict.get('tags', '[]'))
+        metadata.token_count = metadata_dict.get('token_count')
+        metadata.namespace = metadata_dict.get('namespace')
+        metadata.related_memories = json.loads(metadata_dict.get('related_memories', '[]'))
 
         return metadata
 
@@ -260,6 +915,20 @@ class VectorStore:
         """Reset all collections (USE WITH CAUTION)"""
         self.client.delete_collection("tier1_active_memory")
         self.client.delete_collection("tier2_persistent_memory")
+        self.client.delete_collection(CLUSTER_COLLECTION)
+        with self._shards_lock:
+            for name in self._shards:
+                self.client.delete_collection(name)
+            self._shards = {}
+            for collection in self.client.list_collections():
+                name = getattr(collection, "name", collection)
+                if name.startswith(CLUSTER_COLLECTION + SHARD_SEPARATOR):
+                    self.client.delete_collection(name)
+            self._cluster_indexes = {}
 
         self.tier1_collection = self.client.create_collection("tier1_active_memory")
         self.tier2_collection = self.client.create_collection("tier2_persistent_memory")
+        self.tier2_clusters = ClusterIndex(self.client.create_collection(CLUSTER_COLLECTION))
+        with self._ledger_lock:
+            self._tier1_tokens = None
+        self._drop_caches()
@@ -0,0 +1,36 @@
+"""Shared fixtures: stores and entries that never load the embedding model"""
+
+import numpy as np
+import pytest
+
+from phase1_hybrid_memory import MemoryEntry, MemoryMetadata, MemoryTier, VectorStore
+
+DIM = 16
+
+
+def random_embedding(rng: np.random.Generator, dim: int = DIM) -> list:
+    return rng.normal(size=dim).astype(np.float32).tolist()
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
+
+
+@pytest.fixture
+def make_entry(rng):
+    """Factory for entries with a precomputed embedding and token count"""
+    def factory(memory_id: str, tier: MemoryTier = MemoryTier.TIER_1_ACTIVE,
+                namespace=None, embedding=None, content=None, token_count=10):
+        return MemoryEntry(
+            id=memory_id,
+            content=content or f"content of {memory_id}",
+            embedding=embedding if embedding is not None else random_embedding(rng),
+            metadata=MemoryMetadata(tier=tier, namespace=namespace, token_count=token_count)
+        )
+    return factory
+
+
+@pytest.fixture
+def vector_store(tmp_path):
+    return VectorStore(persist_directory=str(tmp_path / "store"))
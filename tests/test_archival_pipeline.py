@@ -0,0 +1,209 @@
+"""Budgeted archival and the adaptive scheduler"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from phase1_hybrid_memory import (
+    ArchivalPipeline, ArchivalScheduler, ClusterConsolidator, MemoryTier
+)
+
+
+@pytest.fixture
+def populate(vector_store, make_entry):
+    """Add Tier 1 entries; the first n_old are old enough to archive"""
+    def factory(n_entries, n_old, namespace=None):
+        old = datetime.now() - timedelta(hours=48)
+        for i in range(n_entries):
+            entry = make_entry(f"m{i}", namespace=namespace)
+            entry.metadata.importance_score = (i % 7 + 1) / 10
+            if i < n_old:
+                entry.metadata.created_at = old
+            vector_store.add_memory(entry)
+        return {f"m{i}" for i in range(n_old)}
+    return factory
+
+
+def tier_ids(store, tier):
+    return {e.id for e in store.list_tier_entries(tier)}
+
+
+def test_item_cap_resumes_until_backlog_is_drained(vector_store, populate):
+    candidates = populate(30, 20)
+    pipeline = ArchivalPipeline(vector_store, scan_batch_size=8)
+
+    archived = []
+    for _ in range(10):
+        batch = pipeline.archive_candidates(0.0, max_items=3)
+        assert len(batch) <= 3
+        archived.extend(batch)
+        if pipeline.backlog == 0:
+            break
+    else:
+        pytest.fail("backlog never drained")
+
+    assert len(archived) == len(set(archived)) == 20
+    assert set(archived) == candidates
+    assert tier_ids(vector_store, MemoryTier.TIER_2_PERSISTENT) == candidates
+    assert len(vector_store.tier1_index) == 10
+
+    # A new pass finds nothing left to archive
+    assert pipeline.archive_candidates(0.0) == []
+    assert pipeline.backlog == 0
+
+
+def test_candidates_are_archived_least_important_first(vector_store, populate):
+    populate(20, 20)
+    pipeline = ArchivalPipeline(vector_store, scan_batch_size=20)
+
+    first = pipeline.archive_candidates(0.0, max_items=5)
+    # The importance scorer adds the same bonuses to every entry here
+    assert sorted(int(memory_id[1:]) % 7 for memory_id in first) == [0, 0, 0, 1, 1]
+    assert pipeline.backlog == 15
+
+
+def test_zero_budget_still_makes_progress(vector_store, populate):
+    populate(12, 6)
+    pipeline = ArchivalPipeline(vector_store, scan_batch_size=4)
+
+    backlogs = []
+    archived = []
+    while True:
+        archived.extend(pipeline.archive_candidates(0.0, time_budget_seconds=0.0))
+        backlogs.append(pipeline.backlog)
+        if pipeline.backlog == 0:
+            break
+        assert len(backlogs) < 20
+
+    assert backlogs == sorted(backlogs, reverse=True)
+    assert sorted(archived) == sorted(f"m{i}" for i in range(6))
+
+
+def test_evaluation_is_capped_by_the_time_budget(vector_store, populate):
+    populate(30, 0)
+    pipeline = ArchivalPipeline(vector_store, scan_batch_size=8)
+
+    backlogs = []
+    for _ in range(4):
+        assert pipeline.archive_candidates(0.0, time_budget_seconds=0.0) == []
+        backlogs.append(pipeline.backlog)
+    assert backlogs == [22, 14, 6, 0]
+
+
+def test_namespaced_entries_archive_into_their_shard(vector_store, populate):
+    populate(4, 4, namespace="alice")
+    pipeline = ArchivalPipeline(vector_store)
+
+    assert len(pipeline.archive_candidates(0.0)) == 4
+    assert vector_store.list_tier_entries(MemoryTier.TIER_1_ACTIVE) == []
+    assert tier_ids(vector_store, MemoryTier.TIER_2_PERSISTENT) == {f"m{i}" for i in range(4)}
+    assert vector_store.tier2_collection.count() == 0
+
+
+def test_next_interval_adapts(vector_store):
+    pipeline = ArchivalPipeline(vector_store)
+    scheduler = ArchivalScheduler(pipeline, interval_seconds=100)
+    metrics = scheduler._metrics
+
+    # Token pressure halves the interval down to the minimum
+    assert scheduler._next_interval(0.9, archived=3) == 50
+    metrics.current_interval = 20
+    assert scheduler._next_interval(0.9, archived=3) == 12.5
+
+    # A backlog shortens it
+    metrics.current_interval = 100
+    pipeline.backlog = 5
+    assert scheduler._next_interval(0.1, archived=3) == 50
+    pipeline.backlog = 0
+
+    # Idle cycles back off up to the maximum
+    assert scheduler._next_interval(0.1, archived=0) == 200
+    metrics.current_interval = 300
+    assert scheduler._next_interval(0.1, archived=0) == 400
+
+    # Normal work returns to the base interval
+    assert scheduler._next_interval(0.1, archived=3) == 100
+
+
+class RecordingConsolidator:
+    """Stand-in consolidator that records the budgets it is given"""
+
+    def __init__(self):
+        self.in_progress = False
+        self.budgets = []
+
+    def should_consolidate(self):
+        return True
+
+    def step(self, time_budget_seconds=None):
+        self.budgets.append(time_budget_seconds)
+        return None
+
+
+def test_cycle_consolidates_only_without_backlog(vector_store, populate):
+    populate(10, 10)
+    consolidator = RecordingConsolidator()
+    scheduler = ArchivalScheduler(
+        ArchivalPipeline(vector_store, scan_batch_size=4),
+        consolidator=consolidator,
+        time_budget_seconds=0.0
+    )
+
+    assert scheduler._run_cycle(0.0) == (1, False)
+    assert consolidator.budgets == []
+
+    while scheduler.pipeline.backlog:
+        scheduler._run_cycle(0.0)
+    assert consolidator.budgets == [0.0]
+
+
+def test_cycle_hands_leftover_budget_to_consolidation(vector_store, make_entry):
+    for i in range(60):
+        vector_store.add_memory(make_entry(f"t2-{i}", tier=MemoryTier.TIER_2_PERSISTENT))
+    consolidator = RecordingConsolidator()
+    scheduler = ArchivalScheduler(
+        ArchivalPipeline(vector_store), consolidator=consolidator, time_budget_seconds=5.0
+    )
+
+    assert scheduler._run_cycle(0.0) == (0, False)
+    assert 4.0 < consolidator.budgets[0] <= 5.0
+
+    real = ClusterConsolidator(vector_store, min_entries=50, page_size=20, seed=0)
+    scheduler = ArchivalScheduler(
+        ArchivalPipeline(vector_store), consolidator=real, time_budget_seconds=None
+    )
+    assert scheduler._run_cycle(0.0) == (0, True)
+    assert vector_store.tier2_clusters.is_trained
+    assert not real.in_progress
+
+
+class SlowPipeline:
+    """Pipeline stub whose cycles overrun the interval"""
+
+    def __init__(self, trigger):
+        self.trigger = trigger
+        self.backlog = 0
+
+    def archive_candidates(self, token_usage, **kwargs):
+        time.sleep(0.25)
+        return []
+
+
+def test_loop_counts_missed_deadlines(vector_store):
+    pipeline = SlowPipeline(ArchivalPipeline(vector_store).trigger)
+    scheduler = ArchivalScheduler(
+        pipeline, interval_seconds=0.1, min_interval_seconds=0.1, max_interval_seconds=0.1
+    )
+
+    async def run():
+        scheduler.start(lambda: 0.0)
+        await asyncio.sleep(0.9)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    metrics = scheduler.get_metrics()
+    assert metrics.cycles_run >= 2
+    # Each 0.25s cycle overruns two or three 0.1s ticks
+    assert 2 * metrics.cycles_run - 2 <= metrics.skipped_ticks <= 3 * metrics.cycles_run
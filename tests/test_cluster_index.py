@@ -0,0 +1,168 @@
+"""Tier 2 cluster index: routing, incremental counts and resumable consolidation"""
+
+import numpy as np
+import pytest
+
+from phase1_hybrid_memory import ClusterConsolidator, ClusterIndex, MemoryTier
+
+T2 = MemoryTier.TIER_2_PERSISTENT
+
+
+def blobs(n_blobs=8, per_blob=25, dim=16, seed=0):
+    """Well separated Gaussian blobs"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_blobs, dim)) * 5.0
+    points = centers[:, None, :] + rng.normal(scale=0.3, size=(n_blobs, per_blob, dim))
+    return points.reshape(-1, dim).astype(np.float32)
+
+
+@pytest.fixture
+def clustered_store(vector_store, make_entry):
+    for i, embedding in enumerate(blobs()):
+        vector_store.add_memory(make_entry(f"m{i}", tier=T2, embedding=embedding.tolist()))
+    return vector_store
+
+
+@pytest.fixture
+def consolidator(clustered_store):
+    return ClusterConsolidator(clustered_store, min_entries=50, page_size=50, seed=0)
+
+
+def stored_labels(collection):
+    results = collection.get(include=["metadatas"])
+    return dict(zip(results["ids"], (m.get(ClusterIndex.CLUSTER_KEY) for m in results["metadatas"])))
+
+
+def assert_counts_match(clusters, collection):
+    labels = list(stored_labels(collection).values())
+    for cluster_id, count in zip(clusters.cluster_ids, clusters.counts):
+        assert count == labels.count(cluster_id)
+    reloaded = ClusterIndex(clusters.collection)
+    assert reloaded.cluster_ids == clusters.cluster_ids
+    np.testing.assert_array_equal(reloaded.counts, clusters.counts)
+
+
+def test_untrained_writes_are_marked_unassigned(clustered_store):
+    assert not clustered_store.tier2_clusters.is_trained
+    assert set(stored_labels(clustered_store.tier2_collection).values()) == {ClusterIndex.UNASSIGNED}
+
+
+def test_routed_search_matches_full_query(clustered_store, consolidator):
+    assert consolidator.consolidate() == ClusterConsolidator.target_clusters(200)
+    clusters = clustered_store.tier2_clusters
+    assert clusters.is_trained and not clusters.retired
+    assert set(stored_labels(clustered_store.tier2_collection).values()) <= set(clusters.cluster_ids)
+
+    rng = np.random.default_rng(1)
+    for query in blobs()[::17] + rng.normal(scale=0.2, size=(12, 16)).astype(np.float32):
+        routed = clustered_store.search_by_embedding(
+            query.tolist(), tier=T2, limit=5, min_score=0.0, n_probe=3
+        )
+        full = clustered_store._query_collection(
+            clustered_store.tier2_collection, query.tolist(), 5, 0.0
+        )
+        assert [e.id for e, _ in routed] == [e.id for e, _ in full]
+
+
+def test_assign_release_keep_member_counts(clustered_store, consolidator, make_entry):
+    consolidator.consolidate()
+    clusters = clustered_store.tier2_clusters
+    collection = clustered_store.tier2_collection
+    assert_counts_match(clusters, collection)
+
+    extra = blobs(seed=0)[:10] + 0.01
+    for i, embedding in enumerate(extra[:5]):
+        clustered_store.add_memory(make_entry(f"new{i}", tier=T2, embedding=embedding.tolist()))
+    clustered_store.bulk_load(
+        T2,
+        ids=[f"bulk{i}" for i in range(5)],
+        embeddings=extra[5:].tolist(),
+        documents=["bulk"] * 5,
+        metadatas=[{"tier": T2.value, ClusterIndex.CLUSTER_KEY: "stale"} for _ in range(5)]
+    )
+    for memory_id in ("m0", "m30", "new1", "bulk2"):
+        assert clustered_store.delete_memory(memory_id)
+
+    assert int(clusters.counts.sum()) == collection.count() == 206
+    assert_counts_match(clusters, collection)
+
+
+def test_release_ignores_unknown_clusters(clustered_store, consolidator):
+    consolidator.consolidate()
+    clusters = clustered_store.tier2_clusters
+    total = int(clusters.counts.sum())
+    assert not clusters.release(ClusterIndex.UNASSIGNED)
+    assert not clusters.release("cluster_0_00000")
+    assert int(clusters.counts.sum()) == total
+
+
+def test_entries_stay_reachable_during_a_stepped_job(clustered_store, make_entry):
+    consolidator = ClusterConsolidator(
+        clustered_store, min_entries=50, page_size=50, max_unassigned_ratio=0.0, seed=0
+    )
+    consolidator.consolidate()
+    collection = clustered_store.tier2_collection
+    first_generation = list(clustered_store.tier2_clusters.cluster_ids)
+
+    # One entry archived before the index existed forces a rebuild
+    collection.update(ids=["m3"], metadatas=[{ClusterIndex.CLUSTER_KEY: ClusterIndex.UNASSIGNED}])
+    assert consolidator.should_consolidate()
+
+    embeddings = dict(zip(*[collection.get(include=["embeddings"])[key] for key in ("ids", "embeddings")]))
+    probes = ["m3"] + [f"m{i}" for i in range(0, 200, 23)]
+    seen_retired = False
+    steps = 0
+    while True:
+        result = consolidator.step(0)
+        steps += 1
+        if steps == 20:
+            # Archived mid-job: labelled by the old generation, or unassigned
+            clustered_store.add_memory(make_entry("late", tier=T2, embedding=embeddings["m7"].tolist()))
+            probes.append("late")
+            embeddings["late"] = embeddings["m7"]
+        seen_retired |= bool(clustered_store.tier2_clusters.retired)
+
+        for memory_id in probes:
+            hits = clustered_store.search_by_embedding(
+                list(embeddings[memory_id]), tier=T2, limit=2, min_score=0.0, n_probe=1
+            )
+            assert memory_id in [e.id for e, _ in hits], (memory_id, steps)
+        if result is not None:
+            break
+
+    assert steps > 20
+    assert seen_retired
+    clusters = clustered_store.tier2_clusters
+    assert not clusters.retired
+    assert not set(first_generation) & set(clusters.cluster_ids)
+    assert set(stored_labels(collection).values()) <= set(clusters.cluster_ids)
+    assert_counts_match(clusters, collection)
+
+
+def test_needs_consolidation_thresholds(vector_store, make_entry):
+    consolidator = ClusterConsolidator(vector_store, min_entries=50, page_size=50, seed=0)
+    collection = vector_store.tier2_collection
+    points = blobs(per_blob=40)
+
+    for i in range(49):
+        vector_store.add_memory(make_entry(f"m{i}", tier=T2, embedding=points[i].tolist()))
+    assert not consolidator.needs_consolidation(collection)
+
+    vector_store.add_memory(make_entry("m49", tier=T2, embedding=points[49].tolist()))
+    assert consolidator.needs_consolidation(collection)
+
+    assert consolidator.consolidate() == 7
+    assert not consolidator.needs_consolidation(collection)
+    assert not consolidator.should_consolidate()
+
+    # More than 10% unassigned
+    ids = [f"m{i}" for i in range(6)]
+    collection.update(ids=ids, metadatas=[{ClusterIndex.CLUSTER_KEY: ClusterIndex.UNASSIGNED}] * 6)
+    assert consolidator.needs_consolidation(collection)
+    consolidator.consolidate()
+    assert not consolidator.needs_consolidation(collection)
+
+    # Growth that calls for twice as many clusters (sqrt(200) >= 2 * 7)
+    for i in range(50, 200):
+        vector_store.add_memory(make_entry(f"m{i}", tier=T2, embedding=points[i].tolist()))
+    assert consolidator.needs_consolidation(collection)
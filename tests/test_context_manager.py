@@ -0,0 +1,61 @@
+"""Tests for budgeted context packing"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from phase1_hybrid_memory.context_manager import solve_greedy, solve_knapsack
+
+
+def brute_force(values, weights, budget):
+    best = 0.0
+    for r in range(len(values) + 1):
+        for subset in itertools.combinations(range(len(values)), r):
+            if sum(weights[i] for i in subset) <= budget:
+                best = max(best, sum(values[i] for i in subset))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_knapsack_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 11))
+    values = rng.uniform(0.0, 1.0, size=n).tolist()
+    weights = rng.integers(1, 60, size=n).tolist()
+    budget = int(rng.integers(1, 200))
+
+    selected = solve_knapsack(values, weights, budget)
+    assert len(set(selected)) == len(selected)
+    assert sum(weights[i] for i in selected) <= budget
+    assert sum(values[i] for i in selected) == pytest.approx(brute_force(values, weights, budget))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_scaled_knapsack_stays_within_budget(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0.0, 1.0, size=10).tolist()
+    weights = rng.integers(100, 5000, size=10).tolist()
+    budget = 12000
+
+    selected = solve_knapsack(values, weights, budget, max_cells=1000)
+    assert sum(weights[i] for i in selected) <= budget
+    assert sum(values[i] for i in selected) <= brute_force(values, weights, budget) + 1e-9
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_greedy_is_within_half_of_optimum(seed):
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(0.0, 1.0, size=8).tolist()
+    weights = rng.integers(1, 60, size=8).tolist()
+    budget = 100
+
+    selected = solve_greedy(values, weights, budget)
+    assert sum(weights[i] for i in selected) <= budget
+    assert sum(values[i] for i in selected) >= 0.5 * brute_force(values, weights, budget) - 1e-9
+
+
+def test_empty_inputs():
+    assert solve_knapsack([], [], 100) == []
+    assert solve_knapsack([1.0], [5], 0) == []
+    assert solve_knapsack([1.0], [5], 4) == []
@@ -0,0 +1,51 @@
+"""Tests for the vectorized similarity helpers (no model is loaded)"""
+
+import numpy as np
+import pytest
+
+from phase1_hybrid_memory.embedding_generator import EmbeddingGenerator
+
+
+@pytest.fixture
+def generator():
+    return EmbeddingGenerator()
+
+
+def full_knn(embeddings, k):
+    matrix = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    scores = matrix @ matrix.T
+    np.fill_diagonal(scores, -np.inf)
+    return np.argsort(-scores, axis=1, kind="stable")[:, :k], np.sort(scores, axis=1)[:, ::-1][:, :k]
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1024])
+def test_blocked_knn_matches_full_matrix(generator, block_size):
+    embeddings = np.random.default_rng(1).normal(size=(60, 12)).astype(np.float32)
+
+    indices, similarities = generator.knn(embeddings, k=5, block_size=block_size)
+    expected_indices, expected_similarities = full_knn(embeddings, 5)
+
+    assert indices.shape == (60, 5)
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(similarities, expected_similarities, rtol=1e-5)
+    assert not np.any(indices == np.arange(60)[:, None])
+
+
+def test_knn_caps_k_at_n_minus_one(generator):
+    indices, similarities = generator.knn(np.eye(3), k=10)
+    assert indices.shape == similarities.shape == (3, 2)
+
+    indices, _ = generator.knn(np.eye(3)[:1], k=4)
+    assert indices.shape == (1, 0)
+
+
+def test_top_k_matches_batch_similarity(generator):
+    rng = np.random.default_rng(2)
+    embeddings = rng.normal(size=(40, 8))
+    query = rng.normal(size=8)
+
+    scores = generator.batch_similarity(query, embeddings)
+    indices, top_scores = generator.top_k(query, embeddings, k=4)
+    np.testing.assert_array_equal(indices, np.argsort(-scores)[:4])
+    np.testing.assert_allclose(top_scores, np.sort(scores)[::-1][:4])
+    assert generator.similarity(query, embeddings[indices[0]]) == pytest.approx(float(top_scores[0]), rel=1e-5)
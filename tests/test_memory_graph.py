@@ -0,0 +1,90 @@
+"""Tests for the related-memory k-NN graph"""
+
+import threading
+
+import pytest
+
+from phase1_hybrid_memory import MemoryGraph, VectorStore
+
+
+def test_insert_offers_reverse_edges_and_remove_cleans_up():
+    graph = MemoryGraph(k=2)
+    graph.insert("a", [], location="c1")
+    graph.insert("b", [("a", 0.9)], location="c1")
+    changed = graph.insert("c", [("a", 0.5), ("b", 0.8)], location="c2")
+
+    assert changed == {"a", "b", "c"}
+    assert graph.neighbors("a") == ["b", "c"]
+    assert graph.neighbors("c") == ["b", "a"]
+    assert graph.location("c") == "c2"
+
+    # "a" is full; a weaker candidate is not kept
+    assert graph.insert("d", [("a", 0.1)]) == {"d"}
+
+    assert graph.remove("b") == {"a", "c"}
+    assert "b" not in graph and graph.location("b") is None
+    assert graph.neighbors("a") == ["c"]
+
+
+def test_concurrent_inserts_keep_graph_consistent():
+    graph = MemoryGraph(k=4)
+
+    def worker(offset):
+        for i in range(200):
+            node = f"n{offset + i}"
+            graph.insert(node, [(f"n{(offset + i) // 2}", 1.0 / (i + 1))])
+
+    threads = [threading.Thread(target=worker, args=(t * 1000,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(graph) == 800
+    for node in [f"n{t * 1000 + i}" for t in range(4) for i in range(200)]:
+        assert len(graph.neighbors(node)) <= 4
+        for source in graph._incoming.get(node, set()):
+            assert node in graph.neighbors(source)
+
+
+def test_store_links_only_within_namespace(tmp_path, make_entry):
+    store = VectorStore(persist_directory=str(tmp_path / "store"), graph_k=3)
+    for i in range(5):
+        store.add_memory(make_entry(f"a{i}", namespace="alice"))
+        store.add_memory(make_entry(f"b{i}", namespace="bob"))
+        store.add_memory(make_entry(f"s{i}"))
+
+    for prefix in "abs":
+        for i in range(5):
+            neighbors = store.graph.neighbors(f"{prefix}{i}")
+            assert neighbors and all(nid.startswith(prefix) for nid in neighbors)
+
+    reloaded = VectorStore(persist_directory=str(tmp_path / "store"))
+    assert reloaded.graph.neighbors("a0") == store.graph.neighbors("a0")
+    assert store.tier1_index.get("a0").metadata.related_memories == store.graph.neighbors("a0")
+
+
+def test_delete_from_fresh_store_unlinks_neighbors(tmp_path, make_entry):
+    path = str(tmp_path / "store")
+    store = VectorStore(persist_directory=path)
+    for i in range(6):
+        store.add_memory(make_entry(f"m{i}"))
+    assert store.rebuild_graph(k=3) == 6
+    linked_to_m1 = [f"m{i}" for i in range(6) if "m1" in store.graph.neighbors(f"m{i}")]
+    assert linked_to_m1
+
+    assert VectorStore(persist_directory=path).delete_memory("m1")
+
+    reopened = VectorStore(persist_directory=path)
+    assert "m1" not in reopened.graph
+    for memory_id in linked_to_m1:
+        assert "m1" not in reopened.graph.neighbors(memory_id)
+        assert "m1" not in [e.id for e in reopened.get_related(memory_id)]
+        assert "m1" not in reopened.tier1_index.get(memory_id).metadata.related_memories
+
+
+def test_rebuild_graph_needs_positive_k(vector_store, make_entry):
+    vector_store.add_memory(make_entry("m0"))
+    with pytest.raises(ValueError):
+        vector_store.rebuild_graph()
+    assert vector_store.graph.neighbors("m0") == []
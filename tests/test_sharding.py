@@ -0,0 +1,126 @@
+"""Namespace sharding: routing, hash-bucket isolation, fan-out search and reload"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from phase1_hybrid_memory import MemoryTier, VectorStore
+from phase1_hybrid_memory.vector_store import TIER_COLLECTIONS
+
+T1 = MemoryTier.TIER_1_ACTIVE
+T2 = MemoryTier.TIER_2_PERSISTENT
+NAMESPACES = ["alice", "bob", "carol", "dave", "erin"]
+
+
+@pytest.fixture(params=[None, 2], ids=["per-namespace", "hash-buckets"])
+def store(request, tmp_path):
+    return VectorStore(persist_directory=str(tmp_path / "store"), n_shards=request.param)
+
+
+@pytest.fixture
+def populated(store, make_entry):
+    """Three Tier 2 entries per namespace plus three without one"""
+    for namespace in NAMESPACES + [None]:
+        for i in range(3):
+            store.add_memory(make_entry(f"{namespace}-{i}", tier=T2, namespace=namespace))
+    return store
+
+
+def _ids(entries):
+    return sorted(entry.id for entry in entries)
+
+
+def test_entries_route_to_their_shard(store, make_entry):
+    store.add_memory(make_entry("plain"))
+    store.add_memory(make_entry("a0", namespace="alice"))
+
+    assert store.tier1_collection.get(ids=["plain"])["ids"] == ["plain"]
+    shard = store.shard_name(T1, "alice")
+    assert shard.startswith(TIER_COLLECTIONS[T1] + "__")
+    assert store.client.get_collection(shard).get(ids=["a0"])["ids"] == ["a0"]
+    assert [c.name for c in store.get_shards(T1, "alice")] == [shard]
+    assert store.get_shards(T2, "alice") == []
+    assert [c.name for c in store.get_shards(T1)] == [TIER_COLLECTIONS[T1], shard]
+
+
+def test_hash_buckets_are_bounded(tmp_path, make_entry):
+    store = VectorStore(persist_directory=str(tmp_path / "store"), n_shards=2)
+    for namespace in NAMESPACES:
+        store.add_memory(make_entry(f"{namespace}-0", namespace=namespace))
+
+    assert len({store.shard_name(T1, ns) for ns in NAMESPACES}) == 2
+    assert len(store.get_shards(T1)) == 3
+
+
+def test_namespaces_are_isolated(populated, rng):
+    query = rng.normal(size=16).tolist()
+    for namespace in NAMESPACES:
+        expected = [f"{namespace}-{i}" for i in range(3)]
+        assert _ids(populated.list_tier_entries(T2, namespace=namespace)) == expected
+        hits = populated.search_by_embedding(query, T2, limit=10, min_score=0.0, namespace=namespace)
+        assert _ids(entry for entry, _ in hits) == expected
+
+
+def test_fan_out_merges_shards_by_score(populated, rng):
+    query = rng.normal(size=16)
+    entries = populated.list_tier_entries(T2)
+    assert len(entries) == 3 * (len(NAMESPACES) + 1)
+
+    distances = {e.id: float(np.sum((np.asarray(e.embedding) - query) ** 2)) for e in entries}
+    expected = sorted(distances, key=distances.get)[:7]
+
+    hits = populated.search_by_embedding(query.tolist(), T2, limit=7, min_score=0.0)
+    assert [entry.id for entry, _ in hits] == expected
+    scores = [score for _, score in hits]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_reload_discovers_shards(populated, rng):
+    reopened = VectorStore(persist_directory=str(populated.persist_directory), n_shards=populated.n_shards)
+
+    assert [c.name for c in reopened.get_shards(T2)] == [c.name for c in populated.get_shards(T2)]
+    assert _ids(reopened.list_tier_entries(T2)) == _ids(populated.list_tier_entries(T2))
+    query = rng.normal(size=16).tolist()
+    hits = reopened.search_by_embedding(query, T2, limit=3, min_score=0.0, namespace="bob")
+    assert _ids(entry for entry, _ in hits) == ["bob-0", "bob-1", "bob-2"]
+
+
+def test_point_ops_find_entries_without_namespace(store, make_entry):
+    for i in range(3):
+        store.add_memory(make_entry(f"a{i}", namespace="alice"))
+
+    assert store.update_memory("a0", {"source": "edited"})
+    assert store.list_tier_entries(T1, namespace="alice")[0].metadata.source == "edited"
+    assert store.move_to_tier2("a1")
+    assert _ids(store.list_tier_entries(T2, namespace="alice")) == ["a1"]
+    assert store.delete_memory("a2")
+    assert store.delete_memory("a1", namespace="bob")
+
+    assert _ids(store.list_tier_entries(T1)) == ["a0"]
+    assert store.list_tier_entries(T2) == []
+    assert not store.delete_memory("missing")
+
+
+def test_shard_creation_races_with_reads(store, make_entry):
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                store.get_shards(T1)
+        except Exception as error:
+            errors.append(error)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for i in range(40):
+            store.add_memory(make_entry(f"m{i}", namespace=f"tenant-{i}"))
+    finally:
+        done.set()
+        reader.join()
+
+    assert errors == []
+    assert len(store.get_shards(T1)) == (3 if store.n_shards else 41)
@@ -0,0 +1,69 @@
+"""Snapshot export, import and replica round trips"""
+
+import numpy as np
+import pytest
+
+from phase1_hybrid_memory import (
+    MemoryTier, VectorStore, SnapshotReplica, export_snapshot, import_snapshot
+)
+
+
+@pytest.fixture
+def populated_store(vector_store, make_entry):
+    for i in range(12):
+        vector_store.add_memory(make_entry(f"t1-{i}", token_count=i + 1))
+    for i in range(8):
+        vector_store.add_memory(make_entry(f"t2-{i}", tier=MemoryTier.TIER_2_PERSISTENT))
+    for i in range(5):
+        vector_store.add_memory(make_entry(f"ns-{i}", namespace="alice"))
+    return vector_store
+
+
+def all_records(store):
+    records = {}
+    for tier in (MemoryTier.TIER_1_ACTIVE, MemoryTier.TIER_2_PERSISTENT):
+        for entry in store.list_tier_entries(tier):
+            records[entry.id] = entry
+    return records
+
+
+def test_round_trip(populated_store, tmp_path):
+    manifest = export_snapshot(populated_store, str(tmp_path / "snap"), page_size=4)
+    assert manifest["count"] == 25
+    assert manifest["dim"] == 16
+
+    target = VectorStore(persist_directory=str(tmp_path / "copy"))
+    assert import_snapshot(str(tmp_path / "snap"), target, batch_size=7) == 25
+
+    original, copy = all_records(populated_store), all_records(target)
+    assert original.keys() == copy.keys()
+    for memory_id, entry in original.items():
+        restored = copy[memory_id]
+        assert restored.content == entry.content
+        assert restored.metadata.tier == entry.metadata.tier
+        assert restored.metadata.namespace == entry.metadata.namespace
+        assert restored.metadata.token_count == entry.metadata.token_count
+        np.testing.assert_allclose(restored.embedding, entry.embedding, rtol=1e-6)
+
+    assert target.get_tier1_token_total() == populated_store.get_tier1_token_total()
+    assert [e.id for e in target.tier1_index.entries("alice")] == [f"ns-{i}" for i in range(5)]
+
+
+def test_replica_matches_live_search(populated_store, tmp_path):
+    export_snapshot(populated_store, str(tmp_path / "snap"))
+    replica = SnapshotReplica(str(tmp_path / "snap"), block_size=3)
+    assert len(replica) == 25
+
+    query = populated_store.list_tier_entries(MemoryTier.TIER_2_PERSISTENT)[2].embedding
+    for tier in (None, MemoryTier.TIER_1_ACTIVE, MemoryTier.TIER_2_PERSISTENT):
+        live = populated_store.search_by_embedding(query, tier=tier, limit=5, min_score=0.0)
+        served = replica.search_by_embedding(query, tier=tier, limit=5, min_score=0.0)
+        assert [e.id for e, _ in served] == [e.id for e, _ in live]
+        np.testing.assert_allclose([s for _, s in served], [s for _, s in live], rtol=1e-4)
+
+
+def test_empty_store_round_trip(vector_store, tmp_path):
+    manifest = export_snapshot(vector_store, str(tmp_path / "snap"))
+    assert manifest["count"] == 0
+    assert import_snapshot(str(tmp_path / "snap"), vector_store) == 0
+    assert SnapshotReplica(str(tmp_path / "snap")).search_by_embedding([0.0] * 4) == []
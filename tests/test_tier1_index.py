@@ -0,0 +1,94 @@
+"""Tests for the in-memory Tier 1 index"""
+
+import numpy as np
+
+from phase1_hybrid_memory import MemoryMetadata, Tier1Index
+
+
+def test_removed_slot_is_reused(make_entry):
+    index = Tier1Index(initial_capacity=4)
+    for i in range(3):
+        index.add(make_entry(f"m{i}"))
+
+    freed = index._slots["m1"]
+    assert index.remove("m1")
+    assert not index.remove("m1")
+    assert "m1" not in index
+
+    index.add(make_entry("m3"))
+    assert index._slots["m3"] == freed
+    assert len(index) == 3
+    assert index._size == 3
+
+
+def test_re_adding_an_entry_keeps_its_slot(make_entry):
+    index = Tier1Index()
+    index.add(make_entry("m0"))
+    slot = index._slots["m0"]
+    index.add(make_entry("m0"))
+    assert index._slots["m0"] == slot
+    assert len(index) == 1
+
+
+def test_grows_and_keeps_rows(make_entry):
+    index = Tier1Index(initial_capacity=2)
+    entries = [make_entry(f"m{i}") for i in range(9)]
+    for entry in entries:
+        index.add(entry)
+
+    assert index._capacity == 16
+    assert len(index) == 9
+    for entry in entries:
+        hits = index.search(entry.embedding, limit=1, min_score=0.0)
+        assert hits[0][0].id == entry.id
+        assert np.isclose(hits[0][1], 1.0)
+
+
+def test_search_matches_brute_force(make_entry, rng):
+    index = Tier1Index(initial_capacity=8)
+    entries = [make_entry(f"m{i}") for i in range(50)]
+    for entry in entries:
+        index.add(entry)
+    for entry in entries[::3]:
+        index.remove(entry.id)
+    live = [e for i, e in enumerate(entries) if i % 3]
+
+    # Ranked by cosine, scored on the 1 / (1 + squared L2) scale
+    query = rng.normal(size=len(live[0].embedding)).astype(np.float32)
+    matrix = np.asarray([e.embedding for e in live])
+    cosine = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    top = np.argsort(-cosine)[:5]
+
+    hits = index.search(query.tolist(), limit=5, min_score=0.0)
+    assert [entry.id for entry, _ in hits] == [live[i].id for i in top]
+    for (_, score), i in zip(hits, top):
+        distance = float(np.sum((matrix[i] - query) ** 2))
+        assert np.isclose(score, 1.0 / (1.0 + distance), rtol=1e-4)
+
+
+def test_namespace_filter(make_entry):
+    index = Tier1Index()
+    index.add(make_entry("a", namespace="alice"))
+    index.add(make_entry("b", namespace="bob"))
+    index.add(make_entry("c"))
+
+    assert [e.id for e in index.entries("alice")] == ["a"]
+    assert [e.id for e in index.entries("nobody")] == []
+    assert len(index.entries()) == 3
+
+    query = index.get("b").embedding
+    assert [e.id for e, _ in index.search(query, limit=3, min_score=0.0, namespace="bob")] == ["b"]
+
+
+def test_refresh_replaces_cached_entry(make_entry):
+    index = Tier1Index()
+    entry = make_entry("m0")
+    index.add(entry)
+
+    metadata = MemoryMetadata(source="edited", namespace="alice")
+    assert index.refresh("m0", content="new content", summary="new summary", metadata=metadata)
+    cached = index.get("m0")
+    assert (cached.content, cached.summary, cached.metadata.source) == ("new content", "new summary", "edited")
+    assert cached.embedding == entry.embedding
+    assert [e.id for e in index.entries("alice")] == ["m0"]
+    assert not index.refresh("missing", "x", None, metadata)
@@ -0,0 +1,50 @@
+"""VectorStore write paths keep the in-memory Tier 1 index in sync"""
+
+import threading
+import time
+
+from phase1_hybrid_memory import MemoryTier
+
+
+def test_update_refreshes_cached_entry(vector_store, make_entry):
+    vector_store.add_memory(make_entry("m0", namespace="alice"))
+    assert vector_store.tier1_index.get("m0").summary is None
+
+    assert vector_store.update_memory("m0", {"summary": "short", "source": "edited"}, namespace="alice")
+    cached = vector_store.tier1_index.get("m0")
+    assert cached.summary == "short"
+    assert cached.metadata.source == "edited"
+    assert cached.content == "content of m0"
+
+
+def test_delete_and_archive_drop_index_and_ledger(vector_store, make_entry):
+    for i in range(3):
+        vector_store.add_memory(make_entry(f"m{i}", token_count=5))
+    assert vector_store.get_tier1_token_total() == 15
+
+    assert vector_store.delete_memory("m0")
+    assert vector_store.move_to_tier2("m1")
+    assert not vector_store.delete_memory("missing")
+
+    assert [e.id for e in vector_store.tier1_index.entries()] == ["m2"]
+    assert vector_store.get_tier1_token_total() == 5
+    assert [e.id for e in vector_store.list_tier_entries(MemoryTier.TIER_2_PERSISTENT)] == ["m1"]
+
+
+def test_write_during_index_load_is_not_lost(vector_store, make_entry, monkeypatch):
+    vector_store.add_memory(make_entry("m0"))
+    load_entries = vector_store._entries_from_results
+    writer = threading.Thread(target=vector_store.add_memory, args=(make_entry("late"),))
+
+    def load_while_writing(results):
+        if writer.ident is None:
+            writer.start()
+            time.sleep(0.2)  # the write reaches ChromaDB after this shard was read
+        return load_entries(results)
+
+    monkeypatch.setattr(vector_store, "_entries_from_results", load_while_writing)
+    index = vector_store.tier1_index
+    writer.join()
+
+    assert writer.ident is not None
+    assert sorted(e.id for e in index.entries()) == ["late", "m0"]